@@ -0,0 +1,93 @@
+import functools
+import os
+from typing import Any, List
+from agents.agents_functions import table_agent_functions as tools
+from agents.agents_functions.charts import CHART_TYPES, chart_output, get_chart_renderer
+from agents.agents_functions.instrumentation import instrumented, phase
+from agents.agents_functions.singletons import process_wide
+
+# SQL runs with the GIL released, so independent queries of one turn run in parallel up to the core count
+TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", str(max(2, os.cpu_count() or 1))))
+
+@process_wide
+def get_tool_executor():
+    """
+    Returns the bounded thread pool the synchronous SQL/schema tools run on, creating it on first use.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="tool")
+
+
+async def run_in_tool_pool(func, *args, **kwargs):
+    """
+    Runs a synchronous function on the tool pool without blocking the event loop.
+    """
+    import asyncio
+    import contextvars
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_tool_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def _in_tool_pool(func):
+    # Coroutine version of a sync tool, keeping its name, signature and docstring for the agent
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_in_tool_pool(func, *args, **kwargs)
+    return wrapper
+
+
+execute_sql = _in_tool_pool(tools.execute_sql)
+fetch_more_rows = _in_tool_pool(tools.fetch_more_rows)
+get_table_schema = _in_tool_pool(tools.get_table_schema)
+
+
+async def execute_sql_batch(queries: List[dict]) -> Any:
+    """
+    Runs several independent SQL queries at once and returns their results in the same order.
+    - queries: a list of {"query": ..., "table": ...}, with the same arguments as execute_sql
+      (round_digits, summary and handle_only are optional).
+    Use it to fetch the same metric from both tables or several breakdowns in one step;
+    the batch takes about as long as its slowest query.
+    """
+    import asyncio
+
+    async def run(item):
+        if not isinstance(item, dict) or "query" not in item or "table" not in item:
+            return {"error": "invalid_batch_item", "message": 'Each item needs "query" and "table".'}
+        try:
+            return await execute_sql(**item)
+        except Exception as e:
+            return {"error": "failed", "message": str(e)}
+
+    return list(await asyncio.gather(*(run(item) for item in queries)))
+
+
+@instrumented
+async def plot_results(data, columns=None, chart_type="pie", save_path=None, figsize=(8,5), palette="Blues_d",
+                       return_format="path") -> Any:
+    """
+    Creates a professional, presentation-ready chart from SQL results.
+    - data: the execute_sql result, or preferably its result_id (e.g. "res_1a2b3c4d").
+    - chart_type: "bar", "line", or "pie"
+    - return_format: "path" saves a PNG and returns its path, "base64" returns a base64-encoded PNG.
+    - Automatically infers meaningful title from column names.
+    Rendering runs on the chart worker pool, so the event loop is never blocked.
+    """
+    try:
+        with phase("prepare"):
+            df = await run_in_tool_pool(tools.preprocess_chart_data, data, columns)
+    except ValueError as e:
+        return str(e)
+    if chart_type not in CHART_TYPES:
+        return "Unsupported chart type."
+
+    with phase("render"):
+        key, png = await get_chart_renderer().render_async(df, chart_type, figsize, palette)
+    with phase("write"):
+        return await run_in_tool_pool(chart_output, key, png, save_path, return_format)
+
+
+# Same tools as table_agent_functions, as coroutines for asyncio agents, plus a batch of independent queries
+async_table_agent_functions = [execute_sql, execute_sql_batch, fetch_more_rows, get_table_schema, plot_results]
@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from agents.agents_functions.singletons import process_wide
+
+CHART_TYPES = ("bar", "line", "pie")
+CHART_DIR = os.getenv("CHART_DIR", "charts")
+CHART_DPI = int(os.getenv("CHART_DPI", "150"))
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "2"))
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "64"))
+
+
+def chart_key(df, chart_type, figsize, palette, dpi) -> str:
+    """
+    Content address of a chart: the same data, columns and options always give the same key.
+    """
+    payload = {
+        "columns": [str(c) for c in df.columns],
+        "rows": df.values.tolist(),
+        "chart_type": chart_type,
+        "figsize": list(figsize),
+        "palette": palette,
+        "dpi": dpi,
+    }
+    return hashlib.sha256(json.dumps(payload, default=str, separators=(",", ":")).encode()).hexdigest()
+
+
+def render_chart(df, chart_type, figsize, palette, dpi) -> bytes:
+    """
+    Renders a chart to PNG bytes with the object-oriented Figure/Agg API (no pyplot global state),
+    so several charts can render at once in worker threads.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    label_col, value_col = df.columns[0], df.columns[1]
+    labels = [str(v) for v in df[label_col]]
+    values = df[value_col].tolist()
+    colors = sns.color_palette(palette, len(df))
+
+    if chart_type == "bar":
+        ax.bar(labels, values, color=colors)
+        ax.set_ylabel(value_col)
+    elif chart_type == "line":
+        ax.plot(labels, values, marker="o", color=colors[0])
+        ax.set_ylabel(value_col)
+    elif chart_type == "pie":
+        ax.pie(values, labels=labels, autopct="%1.1f%%", colors=colors)
+        ax.set_ylabel("")
+
+    ax.set_xlabel(label_col)
+    ax.set_title(f"{value_col} by {label_col}", fontsize=14, fontweight="bold")
+    for tick in ax.get_xticklabels():
+        tick.set_rotation(45)
+        tick.set_horizontalalignment("right")
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+
+class ChartRenderer:
+    """
+    Renders charts on a worker thread pool behind a content-addressed LRU cache.
+    The cache holds futures, so concurrent requests for the same chart share one render.
+    """
+
+    def __init__(self, workers: int = CHART_WORKERS, cache_size: int = CHART_CACHE_SIZE):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.cache_size = cache_size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chart")
+        self._cache = OrderedDict()  # key -> Future[bytes]
+        self._lock = threading.Lock()
+
+    def submit(self, df, chart_type, figsize, palette, dpi=CHART_DPI):
+        """
+        Returns (key, future of the PNG bytes), rendering only on a cache miss.
+        """
+        figsize = tuple(figsize)
+        key = chart_key(df, chart_type, figsize, palette, dpi)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                self._cache.move_to_end(key)
+                return key, future
+            future = self._pool.submit(render_chart, df, chart_type, figsize, palette, dpi)
+            self._cache[key] = future
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        future.add_done_callback(lambda f: f.exception() and self._discard(key, f))
+        return key, future
+
+    def _discard(self, key, future):
+        with self._lock:
+            if self._cache.get(key) is future:
+                del self._cache[key]
+
+    def render(self, df, chart_type, figsize, palette, dpi=CHART_DPI):
+        key, future = self.submit(df, chart_type, figsize, palette, dpi)
+        return key, future.result()
+
+    async def render_async(self, df, chart_type, figsize, palette, dpi=CHART_DPI):
+        import asyncio
+
+        key, future = self.submit(df, chart_type, figsize, palette, dpi)
+        return key, await asyncio.wrap_future(future)
+
+
+def chart_output(key: str, png: bytes, save_path=None, return_format="path") -> str:
+    """
+    Returns the chart as a base64 data URI, or writes it (atomically) and returns its path.
+    Without a save_path the file is named after the chart's content key.
+    """
+    if return_format == "base64":
+        return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+    if save_path is None:
+        os.makedirs(CHART_DIR, exist_ok=True)
+        save_path = os.path.join(CHART_DIR, f"{key[:16]}.png")
+    tmp = f"{save_path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(png)
+    os.replace(tmp, save_path)
+    return f"Chart saved to {save_path}"
+
+
+@process_wide
+def get_chart_renderer() -> ChartRenderer:
+    """
+    Returns the process-wide chart renderer, creating it on first use.
+    """
+    return ChartRenderer()
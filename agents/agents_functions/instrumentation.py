@@ -0,0 +1,251 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# TOOL_TRACE_LOG: file path for JSON-lines trace records ("-" for stderr)
+# TOOL_TRACE_OTEL: "1" to also emit OpenTelemetry spans (OTLP to TOOL_TRACE_OTEL_ENDPOINT)
+TRACE_LOG = os.getenv("TOOL_TRACE_LOG")
+TRACE_OTEL = os.getenv("TOOL_TRACE_OTEL", "0") == "1"
+OTEL_ENDPOINT = os.getenv("TOOL_TRACE_OTEL_ENDPOINT", "http://localhost:4317")
+MAX_RECORDS = 10_000
+
+logger = logging.getLogger("table_agent.trace")
+
+_current = contextvars.ContextVar("tool_span", default=None)
+_tracer = None
+
+
+class _Span:
+    def __init__(self, tool, round_info):
+        self.tool = tool
+        self.round = round_info
+        self.phases = {}
+        self.rows = None
+        self.payload_bytes = None
+        self.error = None
+
+
+class Recorder:
+    """
+    Collects one record per tool call (duration, per-phase timings, rows, payload size,
+    orchestrator round) and the wall time of each run, for the end-of-run summary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = deque(maxlen=MAX_RECORDS)
+        self.run_seconds = 0.0
+        self.round = None  # {"round": n, "kind": ..., "agent": ...} of the current orchestrator round
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.run_seconds = 0.0
+            self.round = None
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> list:
+        """
+        Returns one row per tool: calls, total/p50/max ms, mean ms per phase, rows and payload bytes.
+        """
+        by_tool = {}
+        with self._lock:
+            for r in self.records:
+                by_tool.setdefault(r["tool"], []).append(r)
+        rows = []
+        for tool, records in sorted(by_tool.items()):
+            durations = [r["ms"] for r in records]
+            phases = {}
+            for r in records:
+                for phase, ms in r["phases"].items():
+                    phases[phase] = phases.get(phase, 0.0) + ms
+            rows.append({
+                "tool": tool,
+                "calls": len(records),
+                "total_ms": sum(durations),
+                "p50_ms": statistics.median(durations),
+                "max_ms": max(durations),
+                "phases_ms": {p: ms / len(records) for p, ms in phases.items()},
+                "rows": sum(r["rows"] or 0 for r in records),
+                "payload_bytes": sum(r["payload_bytes"] or 0 for r in records),
+            })
+        return rows
+
+    def print_summary(self, title="Tool timings"):
+        rows = self.summary()
+        tool_ms = sum(r["total_ms"] for r in rows)
+        print(f"\n{title}")
+        print(f"{'tool':<20}{'calls':>6}{'total ms':>11}{'p50 ms':>10}{'max ms':>10}{'rows':>9}{'bytes':>10}  phases (mean ms)")
+        for r in rows:
+            phases = ", ".join(f"{p}={ms:.1f}" for p, ms in r["phases_ms"].items())
+            print(f"{r['tool']:<20}{r['calls']:>6}{r['total_ms']:>11.1f}{r['p50_ms']:>10.1f}{r['max_ms']:>10.1f}"
+                  f"{r['rows']:>9}{r['payload_bytes']:>10}  {phases}")
+        if self.run_seconds:
+            run_ms = self.run_seconds * 1000
+            print(f"run wall time {run_ms:.0f} ms = tools {tool_ms:.0f} ms + LLM/orchestration {run_ms - tool_ms:.0f} ms")
+
+
+recorder = Recorder()
+
+
+def set_round(round_index: int, kind: str = None, agent: str = None):
+    """
+    Tags the following tool calls with the orchestrator round they belong to.
+    """
+    recorder.round = {"round": round_index, "kind": kind, "agent": agent}
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Times a phase (load, query, fetch, serialize, render, ...) of the current tool call.
+    """
+    span = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if span is not None:
+            span.phases[name] = span.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+@contextmanager
+def run(name: str = "run"):
+    """
+    Times a whole agent run, so the summary can split tool time from LLM/orchestration time.
+    """
+    start = time.perf_counter()
+    with _otel_span(f"agent_run {name}", {}):
+        try:
+            yield
+        finally:
+            recorder.run_seconds += time.perf_counter() - start
+
+
+def _result_stats(span, result):
+    with phase("serialize"):
+        if isinstance(result, list):
+            span.rows = len(result)
+        elif isinstance(result, dict) and isinstance(result.get("row_count"), int):
+            span.rows = result["row_count"]
+        elif isinstance(result, dict) and result.get("data"):
+            span.rows = len(result["data"][0])
+        span.payload_bytes = len(str(result))
+
+
+def _finish(span, start):
+    record = {
+        "event": "tool_call",
+        "tool": span.tool,
+        "ms": (time.perf_counter() - start) * 1000,
+        "phases": span.phases,
+        "rows": span.rows,
+        "payload_bytes": span.payload_bytes,
+        "round": span.round,
+        "error": span.error,
+    }
+    recorder.add(record)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record, default=str))
+
+
+@contextmanager
+def _otel_span(name, attributes):
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as otel_span:
+        yield otel_span
+
+
+def instrumented(func):
+    """
+    Wraps a tool (sync or async) to record its timings, phases, rows and payload size.
+    The wrapper keeps the tool's name, signature and docstring.
+    """
+    def _start():
+        span = _Span(func.__name__, recorder.round)
+        return span, _current.set(span), time.perf_counter()
+
+    def _otel_attributes(span):
+        attributes = {"tool": span.tool, "rows": span.rows or 0, "payload_bytes": span.payload_bytes or 0}
+        if span.round:
+            attributes["round"] = span.round["round"]
+        attributes.update({f"phase_ms.{p}": ms for p, ms in span.phases.items()})
+        return attributes
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            span, token, start = _start()
+            try:
+                with _otel_span(f"tool {span.tool}", {}) as otel_span:
+                    result = await func(*args, **kwargs)
+                    _result_stats(span, result)
+                    if otel_span is not None:
+                        otel_span.set_attributes(_otel_attributes(span))
+                    return result
+            except Exception as e:
+                span.error = repr(e)
+                raise
+            finally:
+                _current.reset(token)
+                _finish(span, start)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        span, token, start = _start()
+        try:
+            with _otel_span(f"tool {span.tool}", {}) as otel_span:
+                result = func(*args, **kwargs)
+                _result_stats(span, result)
+                if otel_span is not None:
+                    otel_span.set_attributes(_otel_attributes(span))
+                return result
+        except Exception as e:
+            span.error = repr(e)
+            raise
+        finally:
+            _current.reset(token)
+            _finish(span, start)
+    return wrapper
+
+
+def configure(log_path: str = TRACE_LOG, otel: bool = TRACE_OTEL, otel_endpoint: str = OTEL_ENDPOINT):
+    """
+    Turns on JSON-lines trace logging and, if the OpenTelemetry SDK and OTLP exporter are
+    installed, span export to a local collector.
+    """
+    global _tracer
+    if log_path:
+        handler = logging.StreamHandler() if log_path == "-" else logging.FileHandler(log_path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    if otel and _tracer is None:
+        try:
+            from opentelemetry import trace
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError as e:
+            logger.warning(f"OpenTelemetry export disabled ({e}).")
+            return
+        provider = TracerProvider(resource=Resource.create({"service.name": "table-agent"}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=otel_endpoint, insecure=True)))
+        trace.set_tracer_provider(provider)
+        _tracer = trace.get_tracer("table_agent")
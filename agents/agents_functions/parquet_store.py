@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import duckdb
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from agents.agents_functions.sql_guard import check_statement, not_a_query
+from agents.agents_functions.table_schemas import arrow_convert_options, arrow_finish, schema_fingerprint
+from agents.agents_functions.table_store import TABLE_FILES, file_sha256
+
+PARQUET_DIR = os.getenv("PARQUET_STORE_DIR", "data/parquet")
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def _literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+class ParquetStore:
+    """
+    Columnar table store: each CSV is converted once to Parquet and queried with DuckDB.
+    - DuckDB only reads the columns (and row groups) a query references.
+    - A CSV is re-converted when its mtime/size and sha256 change.
+    - Exposes the same interface as TableStore so execute_sql can use either backend.
+    - Queries run in a locked-down database: it can read the tables' Parquet files and nothing
+      else on disk, and validate() accepts only a single SELECT statement.
+    """
+
+    dialect = "duckdb"
+    query_errors = (duckdb.Error,)
+
+    def __init__(self, parquet_dir: str = PARQUET_DIR, table_files: dict = None):
+        self.parquet_dir = os.path.abspath(parquet_dir)
+        self.table_files = dict(table_files or TABLE_FILES)
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._versions = {}
+        self._db = duckdb.connect(":memory:")
+        # No file access outside the Parquet copies (COPY TO, read_csv, ATTACH, INSTALL), and no SET to undo it
+        allowed = ", ".join(_literal(self._paths(t)[0]) for t in self.table_files)
+        self._db.execute(f"SET allowed_paths = [{allowed}]")
+        self._db.execute("SET enable_external_access = false")
+        self._db.execute("SET lock_configuration = true")
+        os.makedirs(self.parquet_dir, exist_ok=True)
+
+    def _paths(self, table):
+        base = os.path.join(self.parquet_dir, table)
+        return f"{base}.parquet", f"{base}.json"
+
+    @contextmanager
+    def connection(self):
+        """
+        Yields a DuckDB cursor with every loaded table registered as a view.
+        """
+        cursor = self._db.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    def close(self):
+        self._db.close()
+
+    def has_table(self, table: str) -> bool:
+        return table in self.table_files
+
+    def version(self, table: str) -> str:
+        return self.ensure_loaded(table)
+
+    def ensure_loaded(self, table: str) -> str:
+        """
+        Makes sure the Parquet copy matches its CSV and returns its version.
+        """
+        stat = os.stat(self.table_files[table])
+        if self._signatures.get(table) == (stat.st_mtime, stat.st_size) and self._has_view(table):
+            return self._versions[table]
+        return self.ingest(table)["version"]
+
+    def _has_view(self, table: str) -> bool:
+        with self.connection() as conn:
+            return conn.execute("SELECT 1 FROM duckdb_views() WHERE view_name = ?", [table]).fetchone() is not None
+
+    def validate(self, query: str) -> dict:
+        """
+        Returns a not_a_query error unless the query is a single SELECT (or WITH ... SELECT) statement.
+        Syntax errors are left to execution, which reports them.
+        """
+        error = check_statement(query)
+        if error is not None:
+            return error
+        with self.connection() as conn:
+            try:
+                statements = conn.extract_statements(query)
+            except duckdb.Error:
+                return None
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            return not_a_query(" The tables are read-only.")
+        return None
+
+    def ingest(self, table: str, full: bool = False) -> dict:
+        """
+        Converts the CSV to Parquet if it changed and returns a summary of what was done.
+        """
+        csv_path = self.table_files[table]
+        parquet_path, meta_path = self._paths(table)
+        with self._lock:
+            stat = os.stat(csv_path)
+            signature = [stat.st_mtime, stat.st_size]
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = None
+
+            schema = schema_fingerprint(table)
+            current = bool(meta and os.path.exists(parquet_path) and meta.get("schema") == schema)
+            if not full and current and meta["signature"] == signature:
+                summary = {"mode": "unchanged", "rows_added": 0, "version": meta["version"]}
+            else:
+                sha = file_sha256(csv_path)
+                if not full and current and meta["version"] == sha:
+                    summary = {"mode": "unchanged", "rows_added": 0, "version": sha}
+                else:
+                    rows = self._convert(table, csv_path, parquet_path)
+                    summary = {"mode": "full", "rows_added": rows, "version": sha}
+                meta = {"signature": signature, "version": sha, "schema": schema,
+                        "row_count": pq.ParquetFile(parquet_path).metadata.num_rows}
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+
+            self._db.execute(f'CREATE OR REPLACE VIEW "{table}" AS SELECT * FROM read_parquet({_literal(parquet_path)})')
+            self._signatures[table] = tuple(signature)
+            self._versions[table] = summary["version"]
+
+        summary.update(table=table, row_count=meta["row_count"])
+        return summary
+
+    def _convert(self, table, csv_path, parquet_path) -> int:
+        # Declared types are applied while parsing; dimension columns are stored dictionary-encoded
+        arrow_table = arrow_finish(pv.read_csv(csv_path, convert_options=arrow_convert_options(table)), table)
+        tmp = f"{parquet_path}.tmp"
+        pq.write_table(arrow_table, tmp, row_group_size=ROW_GROUP_SIZE, compression="zstd")
+        os.replace(tmp, parquet_path)
+        return arrow_table.num_rows
+
+    def rewrite_query(self, query: str, tables: list) -> str:
+        # Columnar scans of the referenced columns are already cheap; no rollups here
+        return query
+
+    def columns(self, table: str) -> list:
+        """
+        Returns (column, DuckDB type) pairs for a loaded table.
+        """
+        self.ensure_loaded(table)
+        with self.connection() as conn:
+            return [(r[0], r[1]) for r in conn.execute(f'DESCRIBE "{table}"').fetchall()]
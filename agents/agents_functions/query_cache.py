@@ -0,0 +1,113 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from agents.agents_functions.singletons import process_wide
+
+CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))
+CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "900"))
+MAX_ROWS_PER_ENTRY = int(os.getenv("QUERY_CACHE_MAX_ROWS", "10000"))
+
+# Quoted literals/identifiers are kept verbatim; everything else is case and whitespace normalized
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normalizes whitespace and keyword/identifier case outside quoted strings.
+    """
+    parts = _QUOTED.split(query.strip().rstrip(";").strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = " ".join(parts[i].split()).lower()
+    return "".join(parts)
+
+
+class QueryCache:
+    """
+    LRU cache of execute_sql results keyed on (normalized SQL, table, data version).
+    - Entries expire after `ttl` seconds and the least recently used are evicted past `max_entries`.
+    - Results larger than `max_rows` are not cached.
+    - Seeing a new data version for a table drops every entry of the old version.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL, max_rows: int = MAX_ROWS_PER_ENTRY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._versions = {}            # table -> latest data version seen
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _check_version(self, table, version):
+        if self._versions.get(table, version) != version:
+            self._invalidate(table)
+        self._versions[table] = version
+
+    def _invalidate(self, table):
+        for key in [k for k in self._entries if k[1] == table]:
+            del self._entries[key]
+
+    def invalidate(self, table: str = None):
+        """
+        Drops the cached results of one table, or of every table.
+        """
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+            else:
+                self._invalidate(table)
+
+    def get(self, query: str, table: str, version: str):
+        """
+        Returns the cached result, or None on a miss.
+        """
+        key = (normalize_sql(query), table, version)
+        with self._lock:
+            self._check_version(table, version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, query: str, table: str, version: str, result):
+        rows = result.get("rows") if isinstance(result, dict) else result
+        if isinstance(rows, list) and len(rows) > self.max_rows:
+            return
+        key = (normalize_sql(query), table, version)
+        with self._lock:
+            self._check_version(table, version)
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+@process_wide
+def get_query_cache() -> QueryCache:
+    """
+    Returns the process-wide query result cache, creating it on first use.
+    """
+    return QueryCache()
@@ -0,0 +1,139 @@
+import ast
+import datetime
+import decimal
+import json
+import math
+import os
+
+# RESULT_ROUND_DIGITS: decimals kept for float values in tool results (unset keeps full precision)
+_round_digits = os.getenv("RESULT_ROUND_DIGITS", "")
+ROUND_DIGITS = int(_round_digits) if _round_digits else None
+# RESULT_SIGNIFICANT_DIGITS: float values are cut to this many significant digits, dropping binary noise
+# such as 10561.800000000001 -> 10561.8 ("" keeps every digit)
+_significant_digits = os.getenv("RESULT_SIGNIFICANT_DIGITS", "12")
+SIGNIFICANT_DIGITS = int(_significant_digits) if _significant_digits else None
+# Column types that the JSON values themselves do not show
+_DESCRIPTIVE_TYPES = {"date", "datetime"}
+
+
+def _value_type(value) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, (float, decimal.Decimal)):
+        return "float"
+    if isinstance(value, datetime.datetime):
+        return "datetime"
+    if isinstance(value, datetime.date):
+        return "date"
+    return "str"
+
+
+def _to_json_value(value):
+    # DuckDB returns DATE/TIMESTAMP/DECIMAL values as Python objects; keep results JSON-serializable
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def _column_type(values) -> str:
+    types = {_value_type(v) for v in values if v is not None}
+    if not types:
+        return "null"
+    if types <= {"int", "float"}:
+        return "float" if "float" in types else "int"
+    return types.pop() if len(types) == 1 else "str"
+
+
+def _round(value, digits):
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        if SIGNIFICANT_DIGITS is not None:
+            value = float(f"{value:.{SIGNIFICANT_DIGITS}g}")
+        if digits is not None:
+            return round(value, digits)
+    return value
+
+
+def _stats(values, digits) -> dict:
+    values = [v for v in values if v is not None]
+    if not values:
+        return {}
+    total = sum(values)
+    return {
+        "min": _round(min(values), digits),
+        "max": _round(max(values), digits),
+        "sum": _round(total, digits),
+        "mean": _round(total / len(values), digits),
+    }
+
+
+def to_compact(columns, rows, round_digits=ROUND_DIGITS, summary: bool = False) -> dict:
+    """
+    Converts query rows to the compact result format returned to the agent:
+    {"columns": [...], "data": [[values of column 0], [values of column 1], ...]}
+    - Column names appear once and values are stored column by column, so no per-row punctuation;
+      the row count is the length of any column.
+    - Dates and datetimes become ISO strings and decimals become floats, so the result is plain JSON.
+      "types" (one per column) is added only when there is a date or datetime column, since the
+      other types can be read from the values.
+    - Floats keep SIGNIFICANT_DIGITS significant digits, and are rounded to `round_digits` decimals
+      when given.
+    - summary=True adds "stats" with min/max/sum/mean of each numeric column (of the returned rows).
+    """
+    data = [list(col) for col in zip(*rows)] if rows else [[] for _ in columns]
+    types = [_column_type(values) for values in data]
+    for i, values in enumerate(data):
+        if any(isinstance(v, (datetime.date, datetime.time, decimal.Decimal)) for v in values):
+            data[i] = [_to_json_value(v) for v in values]
+    for i, column_type in enumerate(types):
+        if column_type == "float":
+            data[i] = [_round(v, round_digits) for v in data[i]]
+
+    result = {"columns": list(columns), "data": data}
+    if _DESCRIPTIVE_TYPES.intersection(types):
+        result["types"] = types
+    if summary:
+        result["stats"] = {
+            column: _stats(values, round_digits)
+            for column, column_type, values in zip(columns, types, data)
+            if column_type in ("int", "float")
+        }
+    return result
+
+
+def is_compact(data) -> bool:
+    return isinstance(data, dict) and "columns" in data and "data" in data
+
+
+def parse_result(data):
+    """
+    Returns a tool result that was passed back as text (JSON or Python repr) as an object.
+    """
+    text = data.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def compact_to_frame(data, columns=None):
+    """
+    Builds a DataFrame straight from a compact result, without reparsing rows.
+    `columns` may select columns by name or, when it has one name per column, rename them.
+    """
+    import pandas as pd  # loaded on the first chart, not at import
+
+    df = pd.DataFrame(dict(zip(data["columns"], data["data"])), columns=data["columns"])
+    if columns is None:
+        return df
+    if all(c in df.columns for c in columns):
+        return df[columns]
+    if len(columns) == len(df.columns):
+        df.columns = columns
+        return df
+    raise ValueError(f"Columns {columns} do not match the result columns {data['columns']}.")
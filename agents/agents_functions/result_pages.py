@@ -0,0 +1,101 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from agents.agents_functions.singletons import process_wide
+
+MAX_RESULT_ROWS = int(os.getenv("MAX_RESULT_ROWS", "200"))
+MAX_RESULT_BYTES = int(os.getenv("MAX_RESULT_BYTES", "16000"))
+COUNT_LIMIT = int(os.getenv("RESULT_COUNT_LIMIT", "100000"))
+FETCH_SIZE = 500
+MAX_CURSORS = 256
+
+
+def read_page(cursor, skip: int = 0, max_rows: int = MAX_RESULT_ROWS, max_bytes: int = MAX_RESULT_BYTES,
+              count_limit: int = COUNT_LIMIT) -> dict:
+    """
+    Streams one page of rows from an executed cursor with fetchmany.
+    - Skips the first `skip` rows, then keeps rows until the row or byte budget is reached
+      (at least one row is always kept so paging makes progress).
+    - Past the budget, rows are only counted, up to `count_limit`.
+    Byte size is measured on the repr of each row, which is what reaches the model.
+    """
+    columns = [d[0] for d in cursor.description] if cursor.description else []
+    while skip > 0:
+        batch = cursor.fetchmany(min(skip, FETCH_SIZE))
+        if not batch:
+            break
+        skip -= len(batch)
+
+    rows, size, extra = [], 0, 0
+    truncated = False
+    while not truncated:
+        batch = cursor.fetchmany(FETCH_SIZE)
+        if not batch:
+            break
+        for i, row in enumerate(batch):
+            row_size = len(repr(row))
+            if rows and (len(rows) >= max_rows or size + row_size > max_bytes):
+                truncated = True
+                extra = len(batch) - i
+                break
+            rows.append(row)
+            size += row_size
+
+    exact = True
+    if truncated:
+        while True:
+            if extra >= count_limit:
+                exact = False
+                break
+            batch = cursor.fetchmany(FETCH_SIZE)
+            if not batch:
+                break
+            extra += len(batch)
+
+    return {
+        "columns": columns,
+        "rows": rows,
+        "truncated": truncated,
+        "row_count": len(rows) + extra,
+        "row_count_exact": exact,
+    }
+
+
+class ResultCursors:
+    """
+    Continuation handles for truncated results.
+    A handle records the query, table, data version and how many rows were already returned;
+    the next page re-runs the query and streams past those rows.
+    """
+
+    def __init__(self, max_cursors: int = MAX_CURSORS):
+        self.max_cursors = max_cursors
+        self._cursors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, query: str, table: str, version: str, offset: int, result_id: str = None) -> str:
+        handle = f"cur_{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._cursors[handle] = {"query": query, "table": table, "version": version, "offset": offset,
+                                     "result_id": result_id}
+            while len(self._cursors) > self.max_cursors:
+                self._cursors.popitem(last=False)
+        return handle
+
+    def get(self, handle: str):
+        with self._lock:
+            return self._cursors.get(handle)
+
+    def discard(self, handle: str):
+        with self._lock:
+            self._cursors.pop(handle, None)
+
+
+@process_wide
+def get_result_cursors() -> ResultCursors:
+    """
+    Returns the process-wide continuation handle registry, creating it on first use.
+    """
+    return ResultCursors()
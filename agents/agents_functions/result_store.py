@@ -0,0 +1,58 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from agents.agents_functions.singletons import process_wide
+
+RESULT_STORE_SIZE = int(os.getenv("RESULT_STORE_SIZE", "128"))
+RESULT_STORE_ROWS = int(os.getenv("RESULT_STORE_ROWS", "200000"))
+HANDLE_MAX_ROWS = int(os.getenv("RESULT_HANDLE_MAX_ROWS", "50000"))
+HANDLE_PREFIX = "res_"
+
+
+def is_handle(value) -> bool:
+    return isinstance(value, str) and value.strip().startswith(HANDLE_PREFIX) and len(value.strip()) <= 32
+
+
+class ResultStore:
+    """
+    Server-side store of execute_sql results, addressed by short handles ("res_1a2b3c4d"),
+    so tools like plot_results can take a result without its rows passing through the model.
+    - An entry keeps the query, table and data version, plus its columns and rows when the whole
+      result fit in the returned page; a truncated result is re-run in full when it is resolved.
+    - The least recently used entries are evicted past `max_results` entries or `max_rows` stored rows.
+    """
+
+    def __init__(self, max_results: int = RESULT_STORE_SIZE, max_rows: int = RESULT_STORE_ROWS):
+        self.max_results = max_results
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    def register(self, query: str, table: str, version: str, columns=None, rows=None) -> str:
+        handle = f"{HANDLE_PREFIX}{uuid.uuid4().hex[:8]}"
+        entry = {"query": query, "table": table, "version": version, "columns": columns, "rows": rows}
+        with self._lock:
+            self._entries[handle] = entry
+            self._rows += len(rows or ())
+            while self._entries and (len(self._entries) > self.max_results or self._rows > self.max_rows):
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted["rows"] or ())
+        return handle
+
+    def get(self, handle: str):
+        with self._lock:
+            entry = self._entries.get(handle.strip())
+            if entry is not None:
+                self._entries.move_to_end(handle.strip())
+            return entry
+
+
+@process_wide
+def get_result_store() -> ResultStore:
+    """
+    Returns the process-wide result store, creating it on first use.
+    """
+    return ResultStore()
@@ -0,0 +1,130 @@
+import re
+
+# Dimensions the agents group by and measures they aggregate
+DIMENSION_COLUMNS = ["Channel", "Partner_Organization", "Brand_1", "Social_Platform", "Seasonal_Event_Name"]
+MEASURE_COLUMNS = ["ME_Value", "Total_Impressions", "Engagements"]
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_IDENT = re.compile(r'"((?:[^"]|"")+)"|\b([A-Za-z_][A-Za-z0-9_]*)\b')
+_AGG = re.compile(r'\b(sum|avg|min|max|count)\s*\(\s*(?:("[^"]+"|[A-Za-z_][A-Za-z0-9_]*)\s*\.\s*)?'
+                  r'(\*|"[^"]+"|[A-Za-z_][A-Za-z0-9_]*)\s*\)', re.IGNORECASE)
+_ANY_AGG = re.compile(r"\b(sum|avg|min|max|count|total|group_concat)\s*\(", re.IGNORECASE)
+# rowid and its aliases would address the rollup's rows, not the table's
+_UNSUPPORTED = re.compile(r"\b(join|distinct|over|union|intersect|except|with|rowid|_rowid_|oid)\b", re.IGNORECASE)
+
+
+def rollup_table(table: str) -> str:
+    return f"_rollup_{table}"
+
+
+def rollup_columns(columns):
+    """
+    Returns the (dimensions, measures) of a table that its rollup covers.
+    """
+    return [c for c in DIMENSION_COLUMNS if c in columns], [c for c in MEASURE_COLUMNS if c in columns]
+
+
+def _rollup_select(table, dims, measures, where=""):
+    aggs = ["COUNT(*) AS row_count"]
+    for m in measures:
+        aggs += [f'SUM("{m}") AS "sum_{m}"', f'COUNT("{m}") AS "count_{m}"',
+                 f'MIN("{m}") AS "min_{m}"', f'MAX("{m}") AS "max_{m}"']
+    dim_list = ", ".join(f'"{d}"' for d in dims)
+    return f'SELECT {dim_list}, {", ".join(aggs)} FROM "{table}" {where} GROUP BY {dim_list}'
+
+
+def refresh_rollup(conn, table: str, columns, after_rowid: int = None):
+    """
+    Maintains the rollup of `table`: one row per combination of its dimension columns, with
+    the row count and the sum/count/min/max of each measure.
+    - A full refresh rebuilds it from the whole table.
+    - With `after_rowid`, only rows appended after that rowid are aggregated and added. Rollup rows
+      are re-aggregated at query time, so the same dimension combination may appear more than once.
+    """
+    dims, measures = rollup_columns(columns)
+    if not dims or not measures:
+        return
+    name = rollup_table(table)
+    if after_rowid is None:
+        conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+        conn.execute(f'CREATE TABLE "{name}" AS {_rollup_select(table, dims, measures)}')
+    else:
+        conn.execute(f'INSERT INTO "{name}" {_rollup_select(table, dims, measures, f"WHERE rowid > {int(after_rowid)}")}')
+
+
+def rewrite_for_rollup(query: str, table: str, columns):
+    """
+    Rewrites an aggregate query over `table` to read from its rollup, or returns None.
+    A query qualifies when it reads only from `table` (no alias, join or subquery), every
+    aggregate is SUM/AVG/MIN/MAX/COUNT of a rollup measure (or COUNT(*)), and every other
+    column it references is a rollup dimension (in SELECT, WHERE, GROUP BY, HAVING or ORDER BY).
+    Columns qualified with the table name (contractual.Channel) are qualified with the rollup instead.
+    """
+    dims, measures = rollup_columns(columns)
+    if not dims or not measures:
+        return None
+
+    text = _STRING.sub("''", query)
+    if text.lower().count("select") != 1 or _UNSUPPORTED.search(text):
+        return None
+    if not re.search(rf'\bfrom\s+("{table}"|{table})\s*(where|group|order|limit|;|$)', text, re.IGNORECASE):
+        return None
+
+    by_lower = {m.lower(): m for m in measures}
+    found, unsupported = [], []
+    # End of the SELECT list, found with string literals blanked out at the same length
+    blanked = _STRING.sub(lambda m: "'" + " " * (len(m.group(0)) - 2) + "'", query)
+    select_end = re.search(r"\bfrom\b", blanked, re.IGNORECASE).start()
+
+    def replace(match):
+        rewritten = _rewrite_aggregate(match)
+        # Unaliased aggregates in the SELECT list keep their original result column name
+        if (rewritten != match.group(0) and match.start() < select_end
+                and re.match(r"\s*(,|from\b)", blanked[match.end():], re.IGNORECASE)):
+            return f'{rewritten} AS "{match.group(0).replace(chr(34), chr(34) * 2)}"'
+        return rewritten
+
+    def _rewrite_aggregate(match):
+        func, qualifier, arg = match.group(1).lower(), match.group(2), match.group(3).strip('"')
+        if qualifier is not None and qualifier.strip('"').lower() != table.lower():
+            unsupported.append(match.group(0))
+            return match.group(0)
+        if arg == "*":
+            if func != "count":
+                unsupported.append(match.group(0))
+                return match.group(0)
+            found.append(arg)
+            # COUNT is 0, not NULL, when no rows match
+            return "COALESCE(SUM(row_count), 0)"
+        m = by_lower.get(arg.lower())
+        if m is None:
+            unsupported.append(match.group(0))
+            return match.group(0)
+        found.append(m)
+        if func == "avg":
+            return f'(SUM("sum_{m}") * 1.0 / SUM("count_{m}"))'
+        if func == "count":
+            return f'COALESCE(SUM("count_{m}"), 0)'
+        if func == "sum":
+            return f'SUM("sum_{m}")'
+        return f'{func.upper()}("{func}_{m}")'
+
+    rewritten = _AGG.sub(replace, query)
+    remaining = _STRING.sub("''", _AGG.sub("", query))
+    if not found or unsupported or _ANY_AGG.search(remaining):
+        return None
+
+    # Every column left outside the aggregates must be a dimension
+    column_lookup = {c.lower(): c for c in columns}
+    for quoted, bare in _IDENT.findall(remaining):
+        name = quoted or bare
+        col = column_lookup.get(name.lower()) if bare else (name if name in columns else None)
+        if col is not None and col not in dims:
+            return None
+
+    rewritten = re.sub(rf'\bfrom\s+("{table}"|{table})', f'FROM "{rollup_table(table)}"', rewritten, count=1,
+                       flags=re.IGNORECASE)
+    # Point table-qualified columns at the rollup; string literals and other quoted names are kept as they are
+    qualified = re.compile(rf"""'(?:[^']|'')*'|(?<![\w"])((?:"{table}"|{table})\s*\.)(?=\s*["A-Za-z_])|"(?:[^"]|"")*\"""",
+                           re.IGNORECASE)
+    return qualified.sub(lambda m: f'"{rollup_table(table)}".' if m.group(1) else m.group(0), rewritten)
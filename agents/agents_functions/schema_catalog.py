@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+
+from agents.agents_functions.column_descriptions import column_descriptions
+from agents.agents_functions.singletons import process_wide
+from agents.agents_functions.table_schemas import TYPE_LABELS, declared_types, read_csv_typed, schema_fingerprint
+from agents.agents_functions.table_store import TABLE_FILES
+
+CATALOG_PATH = os.getenv("SCHEMA_CATALOG_PATH", "data/schema_catalog.json")
+SAMPLE_ROWS = 1000
+
+
+class SchemaCatalog:
+    """
+    Precomputed schema (column, dtype, description) for every table.
+    - Built once per data version, keyed on the CSV's mtime and size and the declared types.
+    - Memoized in process and persisted as JSON next to the data, so a cold
+      start only needs a stat() per table instead of parsing any CSV.
+    - Dtypes are the declared types of table_schemas; other columns are inferred from a bounded sample of rows.
+    """
+
+    def __init__(self, path: str = CATALOG_PATH, table_files: dict = None, sample_rows: int = SAMPLE_ROWS):
+        self.path = path
+        self.table_files = dict(table_files or TABLE_FILES)
+        self.sample_rows = sample_rows
+        self._lock = threading.Lock()
+        self._entries = None  # table -> {"signature": [mtime, size], "schema": [...]}
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def _build(self, table: str) -> list:
+        sample = read_csv_typed(self.table_files[table], table, nrows=self.sample_rows)
+        types = declared_types(table)
+        descriptions = column_descriptions.get(table, {})
+        return [
+            {
+                "column": col,
+                "dtype": TYPE_LABELS[types[col]] if col in types else str(sample[col].dtype),
+                "description": descriptions.get(col, "No description available"),
+            }
+            for col in sample.columns
+        ]
+
+    def get(self, table: str) -> list:
+        """
+        Returns the schema of a table, rebuilding it only if its CSV changed.
+        """
+        stat = os.stat(self.table_files[table])
+        signature = [stat.st_mtime, stat.st_size, schema_fingerprint(table)]
+        entries = self._entries
+        if entries is not None and table in entries and entries[table]["signature"] == signature:
+            return entries[table]["schema"]
+
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read()
+            entry = self._entries.get(table)
+            if entry is None or entry["signature"] != signature:
+                entry = {"signature": signature, "schema": self._build(table)}
+                self._entries[table] = entry
+                self._write()
+            return entry["schema"]
+
+    def columns(self, table: str) -> list:
+        return [c["column"] for c in self.get(table)]
+
+
+@process_wide
+def get_catalog() -> SchemaCatalog:
+    """
+    Returns the process-wide schema catalog, creating it on first use.
+    """
+    return SchemaCatalog()
@@ -0,0 +1,24 @@
+import functools
+import threading
+
+
+def process_wide(factory):
+    """
+    Turns a factory into a get_x() that returns one process-wide instance, created on first use.
+    Concurrent first calls wait on a lock, so the factory runs once (stores and pools are not cheap to
+    create twice); later calls return the instance without locking.
+    Every process-wide accessor goes through this: get_store, get_catalog, get_query_cache,
+    get_result_cursors, get_result_store, get_chart_renderer and get_tool_executor.
+    """
+    instance = []
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return get
@@ -0,0 +1,277 @@
+import difflib
+import os
+import re
+import sqlite3
+
+from agents.agents_functions.rollups import rollup_table
+
+# SQL_MAX_COST: estimated row visits above which a query is rejected (or auto-limited when it streams)
+MAX_COST = int(os.getenv("SQL_MAX_COST", "200000000"))
+AUTO_LIMIT = int(os.getenv("SQL_AUTO_LIMIT", "200"))
+UNKNOWN_ROWS = 1000  # assumed size of a subquery or CTE the plan scans
+
+_LEADING_COMMENTS = re.compile(r"^\s*(?:(?:--[^\n]*\n|/\*.*?\*/)\s*)*", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_QUOTED = re.compile(r'"((?:[^"]|"")+)"')
+# Words after which a double-quoted name is an operand rather than an alias ("... AS x" is always an alias)
+_KEYWORDS = {
+    "select", "from", "where", "and", "or", "not", "on", "by", "having", "join", "using", "when", "then", "else",
+    "case", "in", "is", "like", "glob", "between", "distinct", "all", "with", "escape", "over", "partition",
+    "desc", "asc", "limit", "offset", "union", "except", "intersect", "values", "cast", "end", "exists",
+}
+# Compile-time actions a read-only query may need; anything else (INSERT, UPDATE, DROP, ATTACH, PRAGMA...) is denied
+_READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+_NOT_STREAMABLE = re.compile(r"\b(group\s+by|order\s+by|distinct|limit|union|intersect|except|window|over)\b|"
+                             r"\b(sum|avg|min|max|count|total|group_concat)\s*\(", re.IGNORECASE)
+# SQLite, then DuckDB error messages
+_ERRORS = [
+    (re.compile(r"^no such column: (.+)"), "unknown_column"),
+    (re.compile(r"^no such table: (.+)"), "unknown_table"),
+    (re.compile(r"^no such function: (.+)"), "unknown_function"),
+    (re.compile(r"^ambiguous column name: (.+)"), "ambiguous_column"),
+    (re.compile(r'^near "(.+)": syntax error'), "syntax_error"),
+    (re.compile(r'Referenced column "(.+?)" not found'), "unknown_column"),
+    (re.compile(r'does not have a column named "(.+?)"'), "unknown_column"),
+    (re.compile(r"Table with name (\S+) does not exist"), "unknown_table"),
+    (re.compile(r"Function with name (\S+) does not exist"), "unknown_function"),
+    (re.compile(r'Ambiguous reference to column name "(.+?)"'), "ambiguous_column"),
+    (re.compile(r'syntax error at or near "(.+?)"'), "syntax_error"),
+]
+
+
+def quote_identifier(name: str) -> str:
+    return name if _IDENTIFIER.match(name) else '"' + name.replace('"', '""') + '"'
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def suggest_columns(name: str, columns, n: int = 3) -> list:
+    """
+    Closest column names to `name`, ignoring case, spaces and punctuation, as SQL identifiers.
+    e.g. "Broadcast_Impressions_(US|HHLD)" -> '"Broadcast_Impressions (US|HHLD)"', "Incidence_Date" -> "Incdence_Date"
+    """
+    by_normalized = {}
+    for col in columns:
+        by_normalized.setdefault(_normalize(col), col)
+    target = _normalize(name)
+    matches = difflib.get_close_matches(target, list(by_normalized), n=n, cutoff=0.75)
+    if target in by_normalized and target not in matches:
+        matches.insert(0, target)
+    return [quote_identifier(by_normalized[m]) for m in matches]
+
+
+def _error(code: str, message: str, **details) -> dict:
+    return {"error": code, "message": message, **details}
+
+
+def not_a_query(detail: str = "") -> dict:
+    return _error("not_a_query", "Only a single SELECT (or WITH ... SELECT) statement can be executed." + detail)
+
+
+def check_statement(query: str) -> dict:
+    """
+    Returns a not_a_query error unless the query starts with SELECT, WITH or VALUES, otherwise None.
+    """
+    if not re.match(r"(select|with|values)\b", _LEADING_COMMENTS.sub("", query), re.IGNORECASE):
+        return not_a_query()
+    return None
+
+
+def _unquoted_call(query: str, name: str):
+    # Text of a column written without quotes that SQLite read as a call, e.g. Broadcast_Impressions (US|HHLD)
+    match = re.search(rf"(?<![\"\w]){re.escape(name)}\s*\([^()]*\)", _STRING.sub("''", query), re.IGNORECASE)
+    return match.group(0) if match else None
+
+
+def _is_alias(text: str, start: int) -> bool:
+    # "AS x", or a name right after an expression: FROM (SELECT ...) "e", SUM(x) "total", FROM contractual "c"
+    before = text[:start]
+    if not before[-1:].isspace():
+        return False
+    before = before.rstrip()
+    if re.search(r"\bas$", before, re.IGNORECASE) or before.endswith((")", '"', "'")) or before[-1:].isdigit():
+        return True
+    word = re.search(r"([A-Za-z_]\w*)$", before)
+    return word is not None and word.group(1).lower() not in _KEYWORDS
+
+
+def _unknown_quoted(query: str, schema: dict):
+    # SQLite reads a double-quoted name that matches nothing as a string literal, so check those names here
+    text = _STRING.sub("''", query)
+    quoted = [(_is_alias(text, m.start()), m.group(1).replace('""', '"')) for m in _QUOTED.finditer(text)]
+    known = {n.lower() for n in schema} | {c.lower() for columns in schema.values() for c in columns}
+    known |= {name.lower() for is_alias, name in quoted if is_alias}
+    for is_alias, name in quoted:
+        if not is_alias and name.lower() not in known:
+            return name
+    return None
+
+
+def validate(query: str, schema: dict) -> dict:
+    """
+    Compiles the query against empty tables built from the cached schema {table: [columns]},
+    so unknown tables/columns and syntax errors are caught before any data is loaded or scanned.
+    Returns None when the query is valid, otherwise a structured error:
+    {"error": code, "message": ..., plus "column"/"table", "suggestions" and "hint" where they apply}.
+    """
+    error = check_statement(query)
+    if error is not None:
+        return error
+
+    text = _LEADING_COMMENTS.sub("", query)
+    all_columns = [c for columns in schema.values() for c in columns]
+    unknown = _unknown_quoted(text, schema)
+    if unknown is not None:
+        return _error("unknown_column", f"Column '{unknown}' does not exist in {', '.join(schema)}.", column=unknown,
+                      suggestions=suggest_columns(unknown, all_columns))
+    shell = sqlite3.connect(":memory:")
+    try:
+        for table, columns in schema.items():
+            shell.execute(f"CREATE TABLE {quote_identifier(table)} ({', '.join(quote_identifier(c) for c in columns)})")
+        shell.set_authorizer(lambda action, *_: sqlite3.SQLITE_OK if action in _READ_ACTIONS else sqlite3.SQLITE_DENY)
+        shell.execute(f"EXPLAIN QUERY PLAN {query}")
+        return None
+    except sqlite3.ProgrammingError as e:
+        return _error("multiple_statements", str(e), hint="Send one SELECT statement per execute_sql call.")
+    except sqlite3.Error as e:
+        message = str(e)
+    finally:
+        shell.close()
+
+    if message == "not authorized":
+        # Compiles, but writes (e.g. WITH ... INSERT) or touches something other than the tables
+        return not_a_query(" The tables are read-only.")
+    return describe_error(message, schema, query)
+
+
+def describe_error(message: str, schema: dict, query: str) -> dict:
+    """
+    Turns a SQLite or DuckDB error message for `query` into a structured error, with column
+    suggestions from the schema {table: [columns]}; unrecognized messages become "invalid_query".
+    """
+    all_columns = [c for columns in schema.values() for c in columns]
+    for pattern, code in _ERRORS:
+        match = pattern.search(message)
+        if match is None:
+            continue
+        name = match.group(1)
+        if code == "unknown_column":
+            column = name.split(".")[-1]
+            return _error(code, f"Column '{column}' does not exist in {', '.join(schema)}.", column=column,
+                          suggestions=suggest_columns(column, all_columns),
+                          hint="Use the exact column names from get_table_schema; quote names with spaces or "
+                               "symbols in double quotes.")
+        if code == "unknown_table":
+            return _error(code, f"Table '{name}' is not available to this query.", table=name,
+                          hint=f"Query only {', '.join(schema)}, or pass every table the query uses as the "
+                               f"`table` argument, e.g. \"contractual,earned\".")
+        if code in ("unknown_function", "syntax_error"):
+            written = _unquoted_call(query, name) if code == "unknown_function" else None
+            suggestions = suggest_columns(written, all_columns) if written else []
+            if suggestions:
+                return _error("unquoted_column", f"'{written}' looks like a column name that needs double quotes.",
+                              column=written, suggestions=suggestions)
+            return _error(code, message)
+        if code == "ambiguous_column":
+            return _error(code, message, column=name,
+                          hint="Prefix the column with its table name or alias, e.g. contractual.Channel.")
+    return _error("invalid_query", message)
+
+
+def _table_rows(conn, alias_tables: dict, name: str) -> int:
+    table = alias_tables.get(name.lower())
+    if table is None:
+        return UNKNOWN_ROWS
+    try:
+        return conn.execute(f'SELECT MAX(rowid) FROM "{table}"').fetchone()[0] or 0
+    except sqlite3.Error:
+        return UNKNOWN_ROWS
+
+
+def _search_rows(conn, detail: str, rows: int) -> int:
+    # Rows an index SEARCH visits per outer row: the average rows per key that ANALYZE records in sqlite_stat1
+    # for the index and the number of "=" constraints, or SQLite's own default of 10 without statistics
+    constraints = re.search(r"\(([^()]*)\)$", detail)
+    equal = len(re.findall(r"(?<![<>!])=\?", constraints.group(1))) if constraints else 0
+    if "INTEGER PRIMARY KEY" in detail:
+        return 1 if equal else max(rows // 4, 1)
+    index = re.search(r"USING (?:COVERING )?INDEX (\S+)", detail)
+    stat = None
+    if index is not None:
+        try:
+            stat = conn.execute("SELECT stat FROM sqlite_stat1 WHERE idx = ?", (index.group(1),)).fetchone()
+        except sqlite3.Error:  # never analyzed
+            pass
+    counts = [int(n) for n in stat[0].split() if n.isdigit()] if stat else []
+    if len(counts) < 2:
+        return min(rows, 10)
+    if not equal:  # range only
+        return max(counts[0] // 4, 1)
+    return counts[min(equal, len(counts) - 1)]
+
+
+def _alias_tables(query: str, tables) -> dict:
+    # Plan lines name tables by alias: map "c" -> "contractual" for "FROM contractual c", etc.
+    names = list(tables) + [rollup_table(t) for t in tables]
+    pattern = re.compile(
+        rf'(?:\bfrom|\bjoin|,)\s*"?({"|".join(re.escape(n) for n in names)})"?'
+        r"(?:\s+(?:as\s+)?(?!(?:where|join|on|using|group|order|limit|inner|left|right|full|cross|natural|union)\b)"
+        r"([A-Za-z_]\w*))?",
+        re.IGNORECASE,
+    )
+    aliases = {n.lower(): n for n in names}
+    for table, alias in pattern.findall(_STRING.sub("''", query)):
+        if alias:
+            aliases[alias.lower()] = aliases[table.lower()]
+    return aliases
+
+
+def estimate_cost(conn, query: str, tables) -> tuple:
+    """
+    Estimates the row visits of a query from SQLite's EXPLAIN QUERY PLAN.
+    Loops under the same parent are nested: a SCAN costs the table's rows per outer row and an
+    index SEARCH the rows per key from the index statistics, so "SCAN a / SCAN b" (a cross product)
+    costs rows(a) * rows(b) and a join on a key with few distinct values costs nearly as much.
+    Returns (estimated row visits, plan lines).
+    """
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+    alias_tables = _alias_tables(query, tables)
+    loops = {}
+    for _, parent, _, detail in plan:
+        match = re.match(r"(SCAN|SEARCH) (\S+)", detail)
+        if match is None or match.group(2) == "CONSTANT":
+            continue
+        rows = _table_rows(conn, alias_tables, match.group(2))
+        loops.setdefault(parent, []).append(rows if match.group(1) == "SCAN" else _search_rows(conn, detail, rows))
+
+    cost = 0
+    for factors in loops.values():
+        outer = 1
+        for rows in factors:
+            outer *= max(rows, 1)
+            cost += outer
+    return cost, [row[3] for row in plan]
+
+
+def guard_cost(conn, query: str, tables, max_cost: int = MAX_COST, auto_limit: int = AUTO_LIMIT):
+    """
+    Returns (query to run, note) for a query within budget, wrapping a streaming query that is over
+    budget (no aggregate, ORDER BY, DISTINCT or LIMIT) in LIMIT `auto_limit`.
+    Returns (None, structured error) when an over-budget query cannot be limited safely.
+    """
+    cost, plan = estimate_cost(conn, query, tables)
+    if cost <= max_cost:
+        return query, None
+    if not _NOT_STREAMABLE.search(_STRING.sub("''", query)):
+        # The query on its own lines, so a trailing -- comment cannot swallow the closing parenthesis
+        limited = f"SELECT * FROM (\n{query.strip().rstrip(';')}\n) LIMIT {auto_limit}"
+        return limited, (f"Estimated {cost:,} row visits (budget {max_cost:,}); "
+                         f"the result was limited to {auto_limit} rows. Add filters or join conditions.")
+    return None, _error("query_too_expensive",
+                        f"Estimated {cost:,} row visits, over the budget of {max_cost:,}.",
+                        estimated_row_visits=cost, plan=plan,
+                        hint="Join on a key (e.g. Seasonal_Event_Name) instead of a cross product, filter rows, "
+                             "or aggregate each table in a subquery before joining.")
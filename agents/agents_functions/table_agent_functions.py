@@ -1,160 +1,213 @@
 from typing import Any, Callable, List
-import pandas as pd
-import sqlite3
-import matplotlib.pyplot as plt
-import io
-import ast, io, base64
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-column_descriptions = {
-        "contractual": {
-        "Incidence_Date": "What date did the content go live?",
-        "Refresh_Date": "What date was this data entered into the sheet?",
-        "Incidence_Timezone": "What timezone did the asset go live in?",
-        "Partner_Organization": "What property did this content involve? (NFL, Premier League, Big 12, Alpine, La Liga, Special Olympics, BJK Cup, or WNBA)",
-        "Channel": "What channel did this exposure come from? (Social, Digital, Broadcast, or In-Stadium)",
-        "Asset_Type": "What type of asset was it? Example: Social = sponsored post, Digital = banner ads or pre-roll, Broadcast = 30s unit",
-        "Seasonal_Event_Name": "During which part of the season did this asset go live? (Week number, tentpole event, or program — must match Earned dataset)",
-        "Social_Platform": "What platform did the social exposure occur on? (Facebook, Instagram, Twitter, TikTok)",
-        "Social_Account": "What partner posted the content? (Only for Social)",
-        "Account_Handle": "The @ handle of the social account that posted the content",
-        "Unique_Social_ID": "Unique social post identifier (concatenation of date, account, and URL)",
-        "Digital_Source": "What website published the asset? (Only for Digital)",
-        "Unique_Digital_ID": "Unique digital article identifier (concatenation of date, source, article title, and URL)",
-        "Media_Type": "Was this photo or video content? (Broadcast = video, Social/Digital can vary)",
-        "URL": "Link to the social post or digital asset",
-        "Market": "Was this regional or national? (Regional = not broadcasted nationally, National = broadcasted nationally)",
-        "Unique_Broadcast_ID": "Unique broadcast program identifier (concatenation of date, broadcast, seasonal event, and home team if applicable)",
-        "Broadcast_Network_(US)": "What US TV broadcaster aired the asset? (Only for US Broadcast)",
-        "Broadcast_Network_(UK)": "What UK TV broadcaster aired the asset? (Only for UK Broadcast)",
-        "Broadcast_Network_(SP)": "What Spanish TV broadcaster aired the asset? (Only for Spain Broadcast)",
-        "Total_Impressions": "How many total impressions did the asset generate across the relevant channel?",
-        "Social_Impressions": "How many total impressions did the social content garner? (Not applicable for TikTok or YouTube — those use video views)",
-        "Digital_Impressions": "How many total impressions did the digital asset garner? (Only for Digital)",
-        "Broadcast_Impressions_(US|HHLD)": "How many household impressions did the US broadcast asset garner? (Only for US Broadcast)",
-        "Broadcast_Impressions_(US|P2+)": "How many total impressions did the US broadcast asset garner? (Only for US Broadcast)",
-        "Broadcast_Impressions_(UK|P2+)": "How many total impressions did the UK broadcast asset garner? (Only for UK Broadcast)",
-        "Broadcast_Impressions_(SP|P2+)": "How many total impressions did the Spain broadcast asset garner? (Only for Spain Broadcast)",
-        "Attendance": "How many people attended the event?",
-        "Visibility": "How visible was the signage?",
-        "Duration": "How many seconds did the signage run for? (Rotational signage only)",
-        "Link_Clicks": "How many times was the ad clicked?",
-        "Engagements": "How many times was the sponsored social post engaged with?",
-        "Video_Views": "How many video views did the sponsored social post garner? (Not applicable if photo)",
-        "ME_Value": "Also considered as MEV, Media equivalency value based on ad rates, duration, and Microsoft integration level",
-        "Organic_or_Paid": "Was the content posted organically or paid/boosted?",
-        "Paid_Budget": "How much money was spent boosting the content/ad?",
-        "Home_Team": "Home team name (Only for broadcasted games)",
-        "Away_Team": "Away team name (Only for broadcasted games)",
-        "Brand_1": "Primary Microsoft brand focus (Copilot, Surface, Windows, Azure, Teams)",
-        "Brand_2": "Secondary Microsoft brand focus, if applicable (Copilot, Surface, Windows, Azure, Teams)",
-        "Content_Message": "Post copy (for social) or article title (for digital)",
-        "Customer_Journey_Stage": "To be populated by Microsoft",
-        "CSA_Targeted": "To be populated by Microsoft",
-        "Audience_Persona": "To be populated by Microsoft"
-    },
-    "earned": {
-        "Incidence_Date": "What date did this exposure happen on?",
-        "Refresh_Date": "What date was this data entered into the sheet?",
-        "Partner_Organization": "What property did this exposure come from? (NFL, Premier League, Big 12, Alpine, La Liga, Special Olympics, BJK Cup, or WNBA)",
-        "Channel": "What channel did this exposure come from? (Social, Digital, Broadcast, or Earned PR)",
-        "Asset_Name": "What asset or branding was the exposure of? For Social: partnership mentions vs signage exposure; for Earned PR: partnership or product mentions vs signage exposure",
-        "Seasonal_Event_Name": "During which part of the season did this exposure occur? (Week number, tentpole event, or program — must match Contractual dataset)",
-        "Social_Platform": "What platform did the social exposure occur on? (Facebook, Instagram, Twitter, TikTok)",
-        "Social_Account": "What social account posted the exposure? (Only for Social)",
-        "Account_Handle": "The @ handle associated with the social account posting the exposure",
-        "Unique_Social_ID": "Unique social post identifier (concatenation of date, account, and URL)",
-        "Digital_Source": "What website posted the article that included the exposure? (Only for Digital)",
-        "Unique_Digital_ID": "Unique digital article identifier (concatenation of date, source, article title, and URL)",
-        "Media_Type": "Was this exposure in photo or video content? (Broadcast = video, Social/Digital can vary)",
-        "URL": "Link to the social post or article that contained the exposure",
-        "Market": "Was this regional or national? (Regional = not broadcasted nationally, National = broadcasted nationally)",
-        "Unique_Broadcast_ID": "Unique broadcast program identifier (concatenation of exposure date, broadcaster, seasonal event, and home team if applicable)",
-        "Broadcast_Network_(US)": "What national US TV broadcaster aired the exposure? (Only for US Broadcast)",
-        "Broadcast_Network_(Local_H)": "What local US TV broadcaster aired the exposure? (Home Team, only for US Broadcast)",
-        "Broadcast_Network_(Local_A)": "What local US TV broadcaster aired the exposure? (Away Team, only for US Broadcast)",
-        "Broadcast_Network_(UK)": "What national UK TV broadcaster aired the exposure? (Only for UK Broadcast)",
-        "Broadcast_Network_(SP)": "What national Spain TV broadcaster aired the exposure? (Only for Spain Broadcast)",
-        "Total_Impressions": "How many total impressions did the exposure generate across the relevant channel?",
-        "Social_Impressions": "How many total impressions did the social exposure garner? (Estimated, only for Social)",
-        "Digital_Impressions": "How many total impressions did the digital exposure garner? (Only for Digital)",
-        "Broadcast_Impressions_(US|HHLD)": "How many household impressions did the US broadcast exposure garner? (Only for US Broadcast)",
-        "Broadcast_Impressions_(US National|P2+)": "How many total impressions did the national US broadcast exposure garner? (Only for US Broadcast)",
-        "Broadcast_Impressions_(US Local H|P2+)": "How many total impressions did the home local US broadcast exposure garner? (Only for locally aired US Broadcasts)",
-        "Broadcast_Impressions_(US Local A|P2+)": "How many total impressions did the away local US broadcast exposure garner? (Only for locally aired US Broadcasts)",
-        "Broadcast_Impressions_(UK|P2+)": "How many total impressions did the national UK broadcast exposure garner? (Only for UK Broadcast)",
-        "Broadcast_Impressions_(SP|P2+)": "How many total impressions did the national Spain broadcast exposure garner? (Only for Spain Broadcast)",
-        "Engagements": "How many times was the social post containing the exposure engaged with?",
-        "Video_Views": "How many video views did the social post containing the exposure garner? (Estimated)",
-        "Exposures": "How many distinct times did branding appear? (Broadcast = 1, Social/Digital can vary; higher counts may account for extrapolated unscanned content)",
-        "Video_Length": "How many seconds was the entire video?",
-        "Duration_per_Exposure": "How many seconds was the exposure visible? (Social/Digital photos = 0)",
-        "30_Sec_Equivalent": "Total exposure time divided by 30",
-        "Duration_Factor": "For Social/Digital video, percentage of the video containing the exposure",
-        "EXT_Factor": "Multiplier applied to account for unscanned Social/Digital content",
-        "ME_Score": "What percentage of the content’s total value is attributable to Microsoft (prominence of branding)?",
-        "ME_Value": "Also considered as MEV, Media equivalency value based on ad rates, duration, and ME score",
-        "Home_Team": "Home team name (Only for broadcasted games)",
-        "Away_Team": "Away team name (Only for broadcasted games)",
-        "Brand_1": "Primary Microsoft brand focus (Copilot, Surface, Windows, Azure, Teams)",
-        "Brand_2": "Secondary Microsoft brand focus, if applicable (Copilot, Surface, Windows, Azure, Teams)",
-        "Content_Message": "Post copy (for Social) or article title (for Digital)",
-        "Customer_Journey_Stage": "To be populated by Microsoft",
-        "CSA_Targeted": "To be populated by Microsoft",
-        "Audience_Persona": "To be populated by Microsoft"
-    }
-}
+from agents.agents_functions.charts import CHART_TYPES, chart_output, get_chart_renderer
+from agents.agents_functions.column_descriptions import column_descriptions
+from agents.agents_functions.instrumentation import instrumented, phase
+from agents.agents_functions.query_cache import get_query_cache
+from agents.agents_functions.result_format import ROUND_DIGITS, compact_to_frame, is_compact, parse_result, to_compact
+from agents.agents_functions.result_pages import get_result_cursors, read_page
+from agents.agents_functions.result_store import HANDLE_MAX_ROWS, get_result_store, is_handle
+from agents.agents_functions.schema_catalog import get_catalog
+from agents.agents_functions.sql_guard import describe_error, guard_cost, validate
+from agents.agents_functions.table_store import get_store
 
 # Updated schema function
+@instrumented
 def get_table_schema(table: str) -> Any:
     """
     Returns the schema (column names, data types) and descriptions of the specified table.
+    The schema comes from the precomputed catalog, so no CSV is parsed unless it changed.
     """
-    if table == 'contractual':
-        df = pd.read_csv("data/contractual_dummy_data.csv")
-    elif table == 'earned':
-        df = pd.read_csv("data/earned_dummy_data.csv")
-    else:
+    catalog = get_catalog()
+    if table not in catalog.table_files:
         return f"Table '{table}' not found."
 
-    schema = []
-    for col in df.columns:
-        desc = column_descriptions.get(table, {}).get(col, "No description available")
-        schema.append({"column": col, "dtype": str(df[col].dtype), "description": desc})
-
-    return schema
+    with phase("catalog"):
+        return catalog.get(table)
 
 
-def execute_sql(query: str, table: str) -> Any:
+@instrumented
+def execute_sql(query: str, table: str, round_digits: int = ROUND_DIGITS, summary: bool = False,
+                handle_only: bool = False) -> Any:
     """
     Executes a SQL query on the specified table's CSV data.
-    The table is loaded into an in-memory SQLite database for querying.
+    `table` may also be "contractual,earned" (or "all") for a query that joins both tables.
+    The table is served from the shared table store (SQLite, or Parquet via DuckDB),
+    which only reloads the CSV when it changes. Results are cached per data version.
+    The result is compact and columnar: {"columns", "data" (one list per column)}, plus "types"
+    when a column holds dates.
+    - round_digits: decimals kept for float values (default: 12 significant digits).
+    - summary: also return min/max/sum/mean of each numeric column as "stats".
+    - result_id: a short handle to the full result; pass it as `data` to plot_results instead of the rows.
+    - handle_only: return the result_id, columns and "row_count" without the data (e.g. when only charting).
+    Rows are streamed within a row/byte budget; a larger result comes back as a page
+    with the total row count and a cursor for `fetch_more_rows`.
+    On SQLite, the query is checked against the cached schema before anything is loaded, and its
+    plan is costed before it runs: an invalid or too expensive query returns {"error", "message",
+    "suggestions"/"hint"} instead, and an expensive row listing is limited with a "warning".
+    On DuckDB, anything but a single SELECT statement returns a "not_a_query" error. On both backends,
+    a query that fails to run returns the same structured error instead of raising.
     """
-    if table == "contractual":
-        df = pd.read_csv("data/contractual_dummy_data.csv")
-    elif table == "earned":
-        df = pd.read_csv("data/earned_dummy_data.csv")
+    store = get_store()
+    tables = _resolve_tables(store, table)
+    if isinstance(tables, str):
+        return tables
+    table = ",".join(tables)
+    with phase("validate"):
+        if store.dialect == "sqlite":
+            catalog = get_catalog()
+            error = validate(query, {t: catalog.columns(t) for t in tables})
+        else:
+            error = store.validate(query)
+    if error is not None:
+        return error
+    with phase("load"):
+        version = _ensure_loaded(store, tables)
+
+    # Repeated queries on the same data version are answered from the result cache
+    cache = get_query_cache()
+    with phase("cache"):
+        page = cache.get(query, table, version)
+    if page is not None:
+        result_id = get_result_store().register(query, table, version, page["columns"], page["rows"])
+        return _compact_result(page, result_id, round_digits, summary, handle_only)
+
+    # Execute the query on a pooled read-only connection
+    with store.connection() as conn:
+        try:
+            run_query, warning = store.rewrite_query(query, tables), None
+            if store.dialect == "sqlite":
+                with phase("plan"):
+                    run_query, warning = guard_cost(conn, run_query, tables)
+                if run_query is None:
+                    return warning
+                if warning is not None:
+                    query = run_query  # later pages and the result handle re-run the limited query
+            with phase("query"):
+                cursor = conn.execute(run_query)
+            with phase("fetch"):
+                page = read_page(cursor)
+        except store.query_errors as e:
+            # e.g. a misspelled column on DuckDB, which has no pre-validation
+            return describe_error(str(e), {t: [c for c, _ in store.columns(t)] for t in tables}, query)
+
+    if page["truncated"]:
+        result_id = get_result_store().register(query, table, version)
+        result = _truncated_page(page, query, table, version, 0, round_digits, summary, result_id, handle_only)
     else:
-        return f"Table '{table}' not found."
+        if warning is None:
+            cache.put(query, table, version, {"columns": page["columns"], "rows": page["rows"]})
+        result_id = get_result_store().register(query, table, version, page["columns"], page["rows"])
+        result = _compact_result(page, result_id, round_digits, summary, handle_only)
+    if warning is not None:
+        result["warning"] = warning
+    return result
+
+
+@instrumented
+def fetch_more_rows(cursor: str) -> Any:
+    """
+    Returns the next page of a truncated `execute_sql` result, given the cursor it returned.
+    """
+    cursors = get_result_cursors()
+    state = cursors.get(cursor)
+    if state is None:
+        return f"Cursor '{cursor}' not found or expired. Re-run the query with execute_sql."
+
+    store = get_store()
+    with phase("load"):
+        version = _ensure_loaded(store, state["table"].split(","))
+    if version != state["version"]:
+        cursors.discard(cursor)
+        return f"Table '{state['table']}' was reloaded since this query ran. Re-run the query with execute_sql."
+
+    query = store.rewrite_query(state["query"], state["table"].split(","))
+    with store.connection() as conn:
+        with phase("query"):
+            result_cursor = conn.execute(query)
+        with phase("fetch"):
+            page = read_page(result_cursor, skip=state["offset"])
+    cursors.discard(cursor)
+    return _truncated_page(page, state["query"], state["table"], state["version"], state["offset"],
+                           result_id=state.get("result_id"))
+
+
+def _resolve_tables(store, table):
+    # "contractual", "earned", a comma-separated list of both, or "all"
+    if table.strip().lower() == "all":
+        return sorted(store.table_files)
+    tables = sorted({t.strip() for t in table.split(",") if t.strip()})
+    for name in tables or [table]:
+        if not store.has_table(name):
+            return f"Table '{name}' not found."
+    return tables
 
-    # Create in-memory SQLite DB and register it under the real table name
-    conn = sqlite3.connect(":memory:")
-    df.to_sql(table, conn, index=False, if_exists="replace")
 
-    # Execute the query
-    cursor = conn.cursor()
-    cursor.execute(query)
-    results = cursor.fetchall()
+def _ensure_loaded(store, tables):
+    return "+".join(store.ensure_loaded(t) for t in tables)
 
-    conn.close()
-    return results
+
+def _compact_result(page, result_id, round_digits, summary, handle_only):
+    with phase("serialize"):
+        result = to_compact(page["columns"], page["rows"], round_digits, summary)
+    result["result_id"] = result_id
+    if handle_only:
+        del result["data"]
+        result["row_count"] = len(page["rows"])
+    return result
+
+
+def _truncated_page(page, query, table, version, offset, round_digits=ROUND_DIGITS, summary=False, result_id=None,
+                    handle_only=False):
+    result = _compact_result(page, result_id, round_digits, summary, handle_only)
+    returned = offset + len(page["rows"])
+    result.update(
+        truncated=page["truncated"],
+        total_rows=page["row_count"] + offset,
+        total_rows_exact=page["row_count_exact"],
+        first_row=offset,
+        cursor=None,
+    )
+    if page["truncated"]:
+        result["cursor"] = get_result_cursors().register(query, table, version, returned, result_id)
+        result["note"] = (
+            "Result truncated to fit the row/byte budget. Call fetch_more_rows(cursor) for the next page, "
+            "or aggregate/filter the query instead of paging through raw rows."
+        )
+    return result
+
+
+def resolve_result(handle: str) -> dict:
+    """
+    Returns the full compact result behind an execute_sql result_id.
+    A truncated result is re-run on the data version it was produced from, up to RESULT_HANDLE_MAX_ROWS rows.
+    """
+    entry = get_result_store().get(handle)
+    if entry is None:
+        raise ValueError(f"Result '{handle}' not found or expired. Re-run the query with execute_sql.")
+    if entry["rows"] is not None:
+        return to_compact(entry["columns"], entry["rows"])
+
+    store = get_store()
+    tables = entry["table"].split(",")
+    with phase("load"):
+        version = _ensure_loaded(store, tables)
+    if version != entry["version"]:
+        raise ValueError(f"Table '{entry['table']}' was reloaded since this query ran. Re-run the query with execute_sql.")
+    with store.connection() as conn:
+        with phase("query"):
+            cursor = conn.execute(store.rewrite_query(entry["query"], tables))
+        with phase("fetch"):
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchmany(HANDLE_MAX_ROWS + 1)
+    if len(rows) > HANDLE_MAX_ROWS:
+        raise ValueError(f"Result '{handle}' has more than {HANDLE_MAX_ROWS} rows. Aggregate the query before charting.")
+    return to_compact(columns, rows)
 
 
 def preprocess_chart_data(data, columns=None):
     """
     Prepares data for plotting:
+    - Takes a compact `execute_sql` result, or its result_id, directly without reparsing rows.
     - Converts string to list if needed.
     - Handles columns as string or list.
     - Auto-generates column names if missing.
@@ -163,65 +216,57 @@ def preprocess_chart_data(data, columns=None):
         raise ValueError("No data provided.")
     
     # Parse string data
-    if isinstance(data, str):
+    if is_handle(data):
+        data = resolve_result(data)
+    elif isinstance(data, str):
         try:
-            data = ast.literal_eval(data.strip())
+            data = parse_result(data)
         except Exception as e:
             raise ValueError(f"Failed to parse data: {e}")
     
-    if not isinstance(data, list) or not all(isinstance(r, (list, tuple)) for r in data):
-        raise ValueError("Data must be a list of lists or tuples.")
-    
     # Handle columns
     if isinstance(columns, str):
         columns = [c.strip() for c in columns.split(",")]
+
+    if is_compact(data):
+        if not data["data"] or not data["data"][0]:
+            raise ValueError("No data provided.")
+        return compact_to_frame(data, columns)
+
+    if not isinstance(data, list) or not all(isinstance(r, (list, tuple)) for r in data):
+        raise ValueError("Data must be a compact execute_sql result or a list of lists or tuples.")
     
     if columns is None:
         columns = ["label", "value"] if len(data[0]) == 2 else [f"col{i}" for i in range(len(data[0]))]
     
+    import pandas as pd  # loaded on the first chart, not at import
     return pd.DataFrame(data, columns=columns)
 
-def plot_results(data, columns=None, chart_type="pie", save_path="chart.png", figsize=(8,5), palette="Blues_d"):
+@instrumented
+def plot_results(data, columns=None, chart_type="pie", save_path=None, figsize=(8,5), palette="Blues_d",
+                 return_format="path"):
     """
     Creates a professional, presentation-ready chart from SQL results.
+    - data: the execute_sql result, or preferably its result_id (e.g. "res_1a2b3c4d").
     - chart_type: "bar", "line", or "pie"
+    - return_format: "path" saves a PNG and returns its path, "base64" returns a base64-encoded PNG.
     - Automatically infers meaningful title from column names.
+    Charts render on a worker pool and identical charts are served from a cache.
     """
     try:
-        df = preprocess_chart_data(data, columns)
+        with phase("prepare"):
+            df = preprocess_chart_data(data, columns)
     except ValueError as e:
         return str(e)
-    
-    plt.figure(figsize=figsize)
-    ax = plt.gca()
-
-    label_col, value_col = df.columns[0], df.columns[1]
-    title = f"{value_col} by {label_col}"
-
-    if chart_type == "bar":
-        df_plot = df.set_index(label_col)
-        df_plot[value_col].plot(kind="bar", ax=ax, color=sns.color_palette(palette, len(df_plot)))
-        ax.set_ylabel(value_col)
-    elif chart_type == "line":
-        df_plot = df.set_index(label_col)
-        df_plot[value_col].plot(kind="line", ax=ax, marker='o', color=sns.color_palette(palette, len(df_plot))[0])
-        ax.set_ylabel(value_col)
-    elif chart_type == "pie":
-        df_plot = df.set_index(label_col)
-        df_plot[value_col].plot(kind="pie", ax=ax, autopct='%1.1f%%', colors=sns.color_palette(palette, len(df_plot)))
-        ax.set_ylabel("")
-    else:
+    if chart_type not in CHART_TYPES:
         return "Unsupported chart type."
 
-    ax.set_xlabel(label_col)
-    plt.title(title, fontsize=14, fontweight="bold")
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300)
-    plt.close()
-    return f"Chart saved to {save_path}"
+    with phase("render"):
+        key, png = get_chart_renderer().render(df, chart_type, figsize, palette)
+    with phase("write"):
+        return chart_output(key, png, save_path, return_format)
 
 
 
 # table_agent_functions: List[Callable[..., Any]] = [execute_sql, get_table_schema]
-table_agent_functions = [execute_sql, get_table_schema, plot_results]
\ No newline at end of file
+table_agent_functions = [execute_sql, fetch_more_rows, get_table_schema, plot_results]
\ No newline at end of file
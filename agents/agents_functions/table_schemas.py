@@ -0,0 +1,245 @@
+import hashlib
+import json
+
+# Strings the CSV exports use for a missing value
+NULL_VALUES = ["", "None", "none", "NULL", "null", "N/A", "n/a", "NaN", "nan"]
+TRUE_VALUES = ["True", "true", "TRUE", "Yes", "yes", "Y", "y", "1"]
+FALSE_VALUES = ["False", "false", "FALSE", "No", "no", "N", "n", "0"]
+
+# Declared column types, applied once at ingest instead of re-coercing values in SQL:
+# - "date": ISO date (stored as "YYYY-MM-DD" text in SQLite, DATE in Parquet)
+# - "category": low-cardinality text, dictionary-encoded in memory and in Parquet
+# - "text": free or high-cardinality text
+# - "int" / "float": numbers ("None" and other null strings become NULL)
+# - "seconds": durations written like "117s", stored as integer seconds
+# - "bool": True/False or Yes/No, stored as 1/0 in SQLite
+_DIMENSIONS = [
+    "Partner_Organization", "Channel", "Seasonal_Event_Name", "Social_Platform", "Digital_Source", "Media_Type",
+    "Market", "Home_Team", "Away_Team", "Brand_1", "Brand_2", "Customer_Journey_Stage", "Audience_Persona",
+]
+
+DECLARED_TYPES = {
+    "contractual": {
+        "Incidence_Date": "date",
+        "Refresh_Date": "date",
+        "Incidence_Timezone": "category",
+        "Asset_Type": "category",
+        "Social_Account": "text",
+        "Account_Handle": "text",
+        "Unique_Social_ID": "text",
+        "Unique_Digital_ID": "text",
+        "URL": "text",
+        "Unique_Broadcast_ID": "text",
+        "Content_Message": "text",
+        "Broadcast_Network_(US)": "category",
+        "Broadcast_Network_(UK)": "category",
+        "Broadcast_Network_(SP)": "category",
+        "Total_Impressions": "int",
+        "Social_Impressions": "int",
+        "Digital_Impressions": "int",
+        "Broadcast_Impressions_(US|HHLD)": "int",
+        "Broadcast_Impressions_(US|P2+)": "int",
+        "Broadcast_Impressions_(UK|P2+)": "int",
+        "Broadcast_Impressions_(SP|P2+)": "int",
+        "Attendance": "int",
+        "Visibility": "category",
+        "Duration": "seconds",
+        "Link_Clicks": "int",
+        "Engagements": "int",
+        "Video_Views": "int",
+        "ME_Value": "float",
+        "Organic_or_Paid": "category",
+        "Paid_Budget": "float",
+        "CSA_Targeted": "bool",
+        **{c: "category" for c in _DIMENSIONS},
+    },
+    "earned": {
+        "Incdence_Date": "date",
+        "Refresh_Date": "date",
+        "Asset_Name": "category",
+        "Social_Account": "text",
+        "Account_Handle": "text",
+        "Unique_Social_ID": "text",
+        "Unique_Digital_ID": "text",
+        "URL": "text",
+        "Unique_Broadcast_ID": "text",
+        "Content_Message": "text",
+        "Broadcast_Network_(US)": "category",
+        "Broadcast_Network_(Local_H)": "category",
+        "Broadcast_Network_(Local _A)": "category",
+        "Broadcast_Network_(UK)": "category",
+        "Broadcast_Network_(SP)": "category",
+        "Total_Impressions": "int",
+        "Social_Impressions": "int",
+        "Digital_Impressions": "int",
+        "Broadcast_Impressions (US|HHLD)": "int",
+        "Broadcast_Impressions_(US National|P2+)": "int",
+        "Broadcast_Impressions_(US Local H|P2+)": "int",
+        "Broadcast_Impressions_(US Local A|P2+)": "int",
+        "Broadcast_Impressions_(UK|P2+)": "int",
+        "Broadcast_Impressions_(SP|P2+)": "int",
+        "Engagements": "int",
+        "Video_Views": "int",
+        "Exposures": "int",
+        "Video_Length": "int",
+        "Duration_per_Exposure": "float",
+        "30_Sec_Equivalent": "float",
+        "Duration_Factor": "float",
+        "EXT_Factor": "float",
+        "ME_Score": "float",
+        "ME_Value": "float",
+        "CSA_Targeted": "bool",
+        **{c: "category" for c in _DIMENSIONS},
+    },
+}
+
+# Type names shown to the agent in get_table_schema, in terms of the stored values
+TYPE_LABELS = {"date": "date (YYYY-MM-DD)", "category": "category", "text": "text", "int": "int", "float": "float",
+               "seconds": "int (seconds)", "bool": "bool (1/0)"}
+_SQLITE_TYPES = {"date": "TEXT", "category": "TEXT", "text": "TEXT", "int": "INTEGER", "float": "REAL",
+                 "seconds": "INTEGER", "bool": "INTEGER"}
+
+
+def declared_types(table: str) -> dict:
+    return DECLARED_TYPES.get(table, {})
+
+
+def schema_fingerprint(table: str) -> str:
+    """
+    Short digest of a table's declared types; stores reload a table when it changes.
+    """
+    return hashlib.sha256(json.dumps(declared_types(table), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def read_csv_typed(source, table: str, **kwargs):
+    """
+    pd.read_csv with the table's declared types: null strings, categories and text are handled by
+    the parser, then dates, units, numbers and booleans are converted column-wise (see apply_types).
+    Extra keyword arguments (chunksize, nrows, header, names, ...) are passed to pd.read_csv;
+    with chunksize the chunks are converted as they are read.
+    """
+    import pandas as pd  # only needed when a CSV is parsed
+
+    types = declared_types(table)
+    dtype = {c: "category" if t == "category" else "str" for c, t in types.items() if t in ("category", "text")}
+    reader = pd.read_csv(source, dtype=dtype, na_values=NULL_VALUES, keep_default_na=True, **kwargs)
+    if kwargs.get("chunksize"):
+        return (apply_types(chunk, table) for chunk in reader)
+    return apply_types(reader, table)
+
+
+def apply_types(df, table: str):
+    """
+    Converts the declared columns of a frame in place, vectorized per column. Unparseable values become null.
+    """
+    import pandas as pd
+
+    for col, kind in declared_types(table).items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if kind == "date":
+            df[col] = pd.to_datetime(values, format="ISO8601", errors="coerce")
+        elif kind == "category" and not isinstance(values.dtype, pd.CategoricalDtype):
+            df[col] = values.astype("category")
+        elif kind in ("int", "seconds"):
+            if kind == "seconds" and not pd.api.types.is_numeric_dtype(values):
+                values = values.astype("str").str.strip().str.rstrip("sS").where(values.notna())
+            numbers = pd.to_numeric(values, errors="coerce")
+            if numbers.isna().any():
+                df[col] = numbers.round().astype("Int64")
+            else:
+                df[col] = pd.to_numeric(numbers.round(), downcast="integer")
+        elif kind == "float":
+            df[col] = pd.to_numeric(values, errors="coerce").astype("float64")
+        elif kind == "bool" and not pd.api.types.is_bool_dtype(values):
+            mapped = values.astype("str").map({**dict.fromkeys(TRUE_VALUES, True), **dict.fromkeys(FALSE_VALUES, False)})
+            df[col] = mapped.where(values.notna()).astype("boolean")
+    return df
+
+
+def to_storage(df, table: str):
+    """
+    Returns the frame as written to SQLite: dates as "YYYY-MM-DD" text (None when missing).
+    """
+    import pandas as pd
+
+    for col, kind in declared_types(table).items():
+        if kind == "date" and col in df.columns:
+            days = df[col].values.astype("datetime64[D]")
+            df[col] = pd.Series(days.astype(str), index=df.index).where(df[col].notna(), None)
+    return df
+
+
+def sqlite_types(table: str, columns) -> dict:
+    """
+    Declared SQLite column types for DataFrame.to_sql.
+    """
+    types = declared_types(table)
+    return {c: _SQLITE_TYPES[types[c]] for c in columns if c in types}
+
+
+def arrow_convert_options(table: str):
+    """
+    pyarrow.csv.ConvertOptions with the declared types; "seconds" columns are read as text and
+    converted afterwards with arrow_finish.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    arrow_types = {
+        "date": pa.date32(), "category": pa.dictionary(pa.int32(), pa.string()), "text": pa.string(),
+        "int": pa.int64(), "float": pa.float64(), "seconds": pa.string(), "bool": pa.bool_(),
+    }
+    types = declared_types(table)
+    return pv.ConvertOptions(
+        column_types={c: arrow_types[kind] for c, kind in types.items()},
+        null_values=NULL_VALUES,
+        true_values=TRUE_VALUES,
+        false_values=FALSE_VALUES,
+        strings_can_be_null=True,
+    )
+
+
+def arrow_finish(arrow_table, table: str):
+    """
+    Converts "seconds" columns ("117s") of a pyarrow table to integer seconds.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for col, kind in declared_types(table).items():
+        if kind == "seconds" and col in arrow_table.column_names:
+            seconds = pc.cast(pc.utf8_rtrim(pc.utf8_trim_whitespace(arrow_table[col]), characters="sS"), pa.int64())
+            arrow_table = arrow_table.set_column(arrow_table.column_names.index(col), col, seconds)
+    return arrow_table
+
+
+def memory_report(table: str, path: str, nrows: int = None) -> dict:
+    """
+    In-memory size of a table read with default pd.read_csv inference vs the declared types,
+    in total, per row and for the columns that changed most.
+    """
+    import pandas as pd
+
+    before = pd.read_csv(path, nrows=nrows)
+    after = read_csv_typed(path, table, nrows=nrows)
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    rows = max(len(after), 1)
+    before_total, after_total = int(before_bytes.sum()), int(after_bytes.sum())
+    columns = sorted(
+        ({"column": c, "before_dtype": str(before[c].dtype), "after_dtype": str(after[c].dtype),
+          "before_bytes": int(before_bytes[c]), "after_bytes": int(after_bytes[c])} for c in after.columns),
+        key=lambda c: c["after_bytes"] - c["before_bytes"],
+    )
+    return {
+        "table": table,
+        "rows": len(after),
+        "before_bytes": before_total,
+        "after_bytes": after_total,
+        "before_bytes_per_row": round(before_total / rows, 1),
+        "after_bytes_per_row": round(after_total / rows, 1),
+        "ratio": round(after_total / max(before_total, 1), 3),
+        "columns": columns,
+    }
@@ -0,0 +1,391 @@
+import hashlib
+import io
+import os
+import queue
+import sqlite3
+import threading
+import uuid
+import warnings
+from contextlib import contextmanager
+
+from agents.agents_functions.rollups import DIMENSION_COLUMNS, refresh_rollup, rewrite_for_rollup
+from agents.agents_functions.singletons import process_wide
+from agents.agents_functions.table_schemas import read_csv_typed, schema_fingerprint, sqlite_types, to_storage
+
+# CSV source for every table the agents can query
+DATA_DIR = os.getenv("TABLE_DATA_DIR", "data")
+TABLE_FILES = {
+    "contractual": f"{DATA_DIR}/contractual_dummy_data.csv",
+    "earned": f"{DATA_DIR}/earned_dummy_data.csv",
+}
+
+BACKEND = os.getenv("TABLE_BACKEND", "sqlite").lower()
+# Join keys shared by contractual and earned (the earned export spells Incidence_Date "Incdence_Date"),
+# plus the dimension columns aggregations are grouped and filtered by
+INDEXED_COLUMNS = {
+    "contractual": ["Seasonal_Event_Name", "Partner_Organization", "Incidence_Date"] + DIMENSION_COLUMNS,
+    "earned": ["Seasonal_Event_Name", "Partner_Organization", "Incdence_Date"] + DIMENSION_COLUMNS,
+}
+
+DB_PATH = os.getenv("TABLE_STORE_PATH", "data/table_store.db")
+# Enough read-only connections for every tool worker to query at once
+POOL_SIZE = int(os.getenv("TABLE_STORE_POOL_SIZE", str(max(4, os.cpu_count() or 1))))
+MMAP_SIZE = int(os.getenv("TABLE_STORE_MMAP_SIZE", str(256 * 1024 * 1024)))
+INCREMENTAL = os.getenv("TABLE_STORE_INCREMENTAL", "1") != "0"
+LOAD_CHUNKSIZE = 100_000
+# Seconds a writer waits for another process's ingest to finish before "database is locked"
+BUSY_TIMEOUT = float(os.getenv("TABLE_STORE_BUSY_TIMEOUT", "60"))
+TAIL_BYTES = 4096
+
+
+def file_sha256(path: str) -> str:
+    """
+    Returns the sha256 hex digest of a file, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tail_sha256(path: str, offset: int) -> str:
+    # Digest of the bytes right before the offset, used to detect rewritten files
+    start = max(0, offset - TAIL_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _line_end(path: str, size: int) -> int:
+    # Offset just past the last newline in the first `size` bytes; a last line without one is still being written
+    with open(path, "rb") as f:
+        end = size
+        while end > 0:
+            start = max(0, end - (1 << 16))
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+class _Prefix(io.RawIOBase):
+    # Read-only view of the first `size` bytes of a file, so the parser stops at a line end
+    def __init__(self, path: str, size: int):
+        self._file = open(path, "rb")
+        self._left = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._file.read(min(len(buffer), self._left))
+        buffer[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _max_refresh_date(df, current):
+    if "Refresh_Date" not in df.columns:
+        return current
+    values = df["Refresh_Date"].dropna().astype(str)
+    if values.empty:
+        return current
+    latest = values.max()
+    return latest if current is None or latest > current else current
+
+
+class TableStore:
+    """
+    Long-lived SQLite database holding the CSV tables.
+    - Each CSV is loaded once into an on-disk database, with the declared column types of
+      table_schemas (dates, categories, numbers, units and booleans normalized at ingest).
+    - The file mtime, size and sha256 are recorded so a changed CSV gets reloaded.
+    - In incremental mode, rows appended to a CSV are ingested from the last byte offset
+      instead of reloading the whole file.
+    - All tables share one database, indexed on their join keys, so one query can join them.
+    - Dimension columns are indexed and a rollup per table, refreshed on ingest, answers
+      matching GROUP BY aggregations without scanning the table.
+    - Queries run on memory-mapped read-only connections reused through a pool sized to the cores,
+      so concurrent tool calls query in parallel.
+    """
+
+    dialect = "sqlite"
+    query_errors = (sqlite3.Error,)
+
+    def __init__(self, db_path: str = DB_PATH, table_files: dict = None, pool_size: int = POOL_SIZE,
+                 incremental: bool = INCREMENTAL):
+        self.db_path = db_path
+        self.incremental = incremental
+        self.table_files = dict(table_files or TABLE_FILES)
+        self._pool = queue.Queue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self._signatures = {}  # table -> (mtime, size) last checked in this process
+        self._versions = {}    # table -> data version (sha256 of the loaded contents)
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._writer() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _table_versions ("
+                "table_name TEXT PRIMARY KEY, path TEXT, mtime REAL, size INTEGER, sha256 TEXT, schema TEXT)"
+            )
+            if "schema" not in {r[1] for r in conn.execute("PRAGMA table_info(_table_versions)")}:
+                conn.execute("ALTER TABLE _table_versions ADD COLUMN schema TEXT")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _ingest_state ("
+                "table_name TEXT PRIMARY KEY, byte_offset INTEGER, tail_sha256 TEXT, "
+                "max_refresh_date TEXT, row_count INTEGER)"
+            )
+
+    @contextmanager
+    def _writer(self):
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        # Concurrent readers share the memory-mapped file instead of each filling its own page cache
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Yields a pooled read-only connection to the store.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def has_table(self, table: str) -> bool:
+        return table in self.table_files
+
+    def version(self, table: str) -> str:
+        """
+        Returns the data version of a table, loading it first if needed.
+        """
+        self.ensure_loaded(table)
+        return self._versions[table]
+
+    def ensure_loaded(self, table: str) -> str:
+        """
+        Makes sure the table in the store matches its CSV and returns its version.
+        The CSV is only parsed when its contents changed since the last load.
+        """
+        path = self.table_files[table]
+        stat = os.stat(path)
+        if self._signatures.get(table) == (stat.st_mtime, stat.st_size):
+            return self._versions[table]
+        return self.ingest(table)["version"]
+
+    def ingest(self, table: str, full: bool = False) -> dict:
+        """
+        Brings the table up to date with its CSV and returns a summary of what was done.
+        - mode "unchanged": the CSV matches the loaded version.
+        - mode "append": only rows added after the recorded byte offset were parsed and inserted.
+        - mode "full": the whole CSV was reloaded (first load, rewritten file, or full=True).
+        """
+        path = self.table_files[table]
+        with self._lock:
+            stat = os.stat(path)
+            signature = (stat.st_mtime, stat.st_size)
+            with self._writer() as conn:
+                row = conn.execute(
+                    "SELECT path, mtime, size, sha256, schema FROM _table_versions WHERE table_name = ?",
+                    (table,),
+                ).fetchone()
+                state = conn.execute(
+                    "SELECT byte_offset, tail_sha256, max_refresh_date FROM _ingest_state WHERE table_name = ?",
+                    (table,),
+                ).fetchone()
+
+            # A table loaded from another path or with other declared types is reloaded in full
+            current = bool(row and state and row[0] == path and row[4] == schema_fingerprint(table))
+            summary = None
+            if not full and current:
+                if (row[1], row[2]) == signature:
+                    summary = {"mode": "unchanged", "rows_added": 0, "version": row[3]}
+                elif self.incremental and stat.st_size > state[0]:
+                    summary = self._append(table, path, signature)
+            if summary is None:
+                sha = file_sha256(path)
+                if not full and current and row[3] == sha:
+                    # Touched but unchanged: only refresh the recorded signature
+                    self._record_version(table, path, signature, sha)
+                    summary = {"mode": "unchanged", "rows_added": 0, "version": sha}
+                else:
+                    summary = self._load(table, path, signature, sha)
+
+            self._signatures[table] = signature
+            self._versions[table] = summary["version"]
+
+        with self.connection() as conn:
+            state = conn.execute(
+                "SELECT byte_offset, max_refresh_date, row_count FROM _ingest_state WHERE table_name = ?",
+                (table,),
+            ).fetchone()
+        summary.update(table=table, byte_offset=state[0], max_refresh_date=state[1], row_count=state[2])
+        return summary
+
+    def _record_version(self, table, path, signature, sha, conn=None):
+        sql = "INSERT OR REPLACE INTO _table_versions VALUES (?, ?, ?, ?, ?, ?)"
+        params = (table, path, signature[0], signature[1], sha, schema_fingerprint(table))
+        if conn is not None:
+            conn.execute(sql, params)
+            return
+        with self._writer() as conn:
+            conn.execute(sql, params)
+
+    def _load(self, table, path, signature, sha):
+        # Load into a staging table and swap it in so readers never see a partial table;
+        # the name is unique so concurrent loads from other processes do not write into it
+        staging = f"{table}__staging_{uuid.uuid4().hex[:8]}"
+        rows = 0
+        max_refresh = None
+        # Parse up to the last complete line of the stat'ed size, like _append, so a line still being
+        # written is left for the next append instead of being stored truncated
+        offset = _line_end(path, signature[1])
+        with self._writer() as conn, io.BufferedReader(_Prefix(path, offset)) as source:
+            try:
+                for chunk in read_csv_typed(source, table, chunksize=LOAD_CHUNKSIZE):
+                    chunk = to_storage(chunk, table)
+                    chunk.to_sql(staging, conn, index=False, if_exists="append",
+                                 dtype=sqlite_types(table, chunk.columns))
+                    rows += len(chunk)
+                    max_refresh = _max_refresh_date(chunk, max_refresh)
+            except BaseException:
+                conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+                raise
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            conn.execute(f'ALTER TABLE "{staging}" RENAME TO "{table}"')
+            self._create_indexes(table, conn)
+            conn.execute(f'ANALYZE "{table}"')
+            refresh_rollup(conn, table, [r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')])
+            self._record_version(table, path, signature, sha, conn=conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO _ingest_state VALUES (?, ?, ?, ?, ?)",
+                (table, offset, _tail_sha256(path, offset), max_refresh, rows),
+            )
+        return {"mode": "full", "rows_added": rows, "version": sha}
+
+    def _create_indexes(self, table, conn):
+        existing = {r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')}
+        for col in dict.fromkeys(INDEXED_COLUMNS.get(table, [])):
+            if col in existing:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_{col}" ON "{table}" ("{col}")')
+
+    def _append(self, table, path, signature):
+        """
+        Appends the rows written after the recorded byte offset.
+        Returns None when the file was rewritten rather than appended to.
+        The offset is read under the write lock, so when several processes ingest the same file
+        the delta is applied once and the others find it already loaded.
+        Limitation: the delta (and a full load) is cut at the last newline, which assumes one row per
+        line. A quoted value with line breaks (e.g. a multi-line Content_Message) caught half-written
+        is read as a broken row, so writers must append such rows whole.
+        """
+        columns = [c for c, _ in self.columns_unchecked(table)]
+        rows = 0
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("SELECT sha256 FROM _table_versions WHERE table_name = ?", (table,)).fetchone()[0]
+            offset, tail_sha, max_refresh = conn.execute(
+                "SELECT byte_offset, tail_sha256, max_refresh_date FROM _ingest_state WHERE table_name = ?",
+                (table,),
+            ).fetchone()
+            if _tail_sha256(path, offset) != tail_sha:
+                return None
+            with open(path, "rb") as f:
+                f.seek(offset)
+                delta = f.read()
+            # Leave a partially written last line for the next run
+            delta = delta[: delta.rfind(b"\n") + 1]
+            new_offset = offset + len(delta)
+            new_version = version
+            if delta:
+                new_version = hashlib.sha256((version + hashlib.sha256(delta).hexdigest()).encode()).hexdigest()
+
+            if delta.strip():
+                last_rowid = conn.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM "{table}"').fetchone()[0]
+                df = to_storage(read_csv_typed(io.BytesIO(delta), table, header=None, names=columns), table)
+                df = df.astype(object).where(df.notna(), None)
+                placeholders = ", ".join("?" for _ in columns)
+                conn.executemany(
+                    f'INSERT INTO "{table}" VALUES ({placeholders})',
+                    df.itertuples(index=False, name=None),
+                )
+                refresh_rollup(conn, table, columns, after_rowid=last_rowid)
+                rows = len(df)
+                max_refresh = _max_refresh_date(df, max_refresh)
+            self._record_version(table, path, signature, new_version, conn=conn)
+            conn.execute(
+                "UPDATE _ingest_state SET byte_offset = ?, tail_sha256 = ?, max_refresh_date = ?, "
+                "row_count = row_count + ? WHERE table_name = ?",
+                (new_offset, _tail_sha256(path, new_offset), max_refresh, rows, table),
+            )
+        return {"mode": "append" if delta else "unchanged", "rows_added": rows, "version": new_version}
+
+    def rewrite_query(self, query: str, tables: list) -> str:
+        """
+        Returns the query to run: aggregations that the table's rollup can answer are
+        rewritten to read from it, anything else is returned unchanged.
+        """
+        if len(tables) != 1:
+            return query
+        columns = [c for c, _ in self.columns_unchecked(tables[0])]
+        return rewrite_for_rollup(query, tables[0], columns) or query
+
+    def columns(self, table: str) -> list:
+        """
+        Returns (column, declared SQLite type) pairs for a loaded table.
+        """
+        self.ensure_loaded(table)
+        return self.columns_unchecked(table)
+
+    def columns_unchecked(self, table: str) -> list:
+        with self.connection() as conn:
+            return [(r[1], r[2]) for r in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+@process_wide
+def get_store():
+    """
+    Returns the process-wide table store, creating it on first use.
+    The backend is chosen with the TABLE_BACKEND environment variable.
+    """
+    # "parquet" keeps tables as Parquet queried through DuckDB; "sqlite" (default) is the CSV path
+    if BACKEND == "parquet":
+        try:
+            from agents.agents_functions.parquet_store import ParquetStore
+            return ParquetStore()
+        except ImportError as e:
+            warnings.warn(f"Parquet backend unavailable ({e}), falling back to SQLite.")
+    return TableStore()
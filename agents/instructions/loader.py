@@ -0,0 +1,15 @@
+import os
+from functools import lru_cache
+
+INSTRUCTIONS_PATH = os.path.join(os.path.dirname(__file__), "instructions.yaml")
+
+
+@lru_cache(maxsize=None)
+def get_instructions(path: str = INSTRUCTIONS_PATH) -> dict:
+    """
+    Loads and parses the agent instructions on first use and caches them for the process.
+    """
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
@@ -0,0 +1,122 @@
+"""
+Compares execute_sql storage paths on a synthetic wide table:
+- "pandas->sqlite": the original path (read the whole CSV, build an in-memory SQLite DB, query).
+- "sqlite store": the persistent SQLite table store, already loaded.
+- "parquet/duckdb": the Parquet backend, already converted; only referenced columns are read.
+- "sqlite store query+rollup": the SQLite store answering the query from its rollup when it matches.
+
+Each measurement runs in a fresh process so peak RSS reflects that path only.
+
+    python -m benchmarks.bench_backends --rows 1000000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import statistics
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+DEFAULT_QUERY = (
+    "SELECT Channel, Partner_Organization, SUM(ME_Value) FROM contractual "
+    "GROUP BY Channel, Partner_Organization"
+)
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_csv(path, rows):
+    # Tile the dummy contractual rows up to the requested size
+    seed = pd.read_csv("data/contractual_dummy_data.csv")
+    reps = -(-rows // len(seed))
+    pd.concat([seed] * reps, ignore_index=True).head(rows).to_csv(path, index=False)
+
+
+def _run_pandas_sqlite(csv_path, query, repeat, out):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = pd.read_csv(csv_path)
+        conn = sqlite3.connect(":memory:")
+        df.to_sql("contractual", conn, index=False, if_exists="replace")
+        conn.execute(query).fetchall()
+        conn.close()
+        timings.append(time.perf_counter() - start)
+    out.put((timings, _peak_rss_mb()))
+
+
+def _make_store(backend, csv_path, workdir):
+    files = {"contractual": csv_path}
+    if backend == "parquet":
+        from agents.agents_functions.parquet_store import ParquetStore
+        return ParquetStore(parquet_dir=os.path.join(workdir, "parquet"), table_files=files)
+    from agents.agents_functions.table_store import TableStore
+    return TableStore(db_path=os.path.join(workdir, "store.db"), table_files=files)
+
+
+def _run_load(backend, csv_path, workdir, out):
+    store = _make_store(backend, csv_path, workdir)
+    start = time.perf_counter()
+    store.ensure_loaded("contractual")
+    out.put(([time.perf_counter() - start], _peak_rss_mb()))
+
+
+def _run_store(backend, csv_path, workdir, query, repeat, rollups, out):
+    store = _make_store(backend, csv_path, workdir)
+    store.ensure_loaded("contractual")
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with store.connection() as conn:
+            conn.execute(store.rewrite_query(query, ["contractual"]) if rollups else query).fetchall()
+        timings.append(time.perf_counter() - start)
+    out.put((timings, _peak_rss_mb()))
+
+
+def _measure(target, *args):
+    out = mp.Queue()
+    proc = mp.Process(target=target, args=(*args, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--query", default=DEFAULT_QUERY)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "contractual.csv")
+        make_csv(csv_path, args.rows)
+        print(f"rows={args.rows} csv={os.path.getsize(csv_path) / 1e6:.1f}MB query={args.query!r}\n")
+        print(f"{'path':<28}{'median s':>10}{'min s':>10}{'peak RSS MB':>14}")
+
+        rows = [("pandas->sqlite (per call)", _measure(_run_pandas_sqlite, csv_path, args.query, args.repeat))]
+        for backend in ("sqlite", "parquet"):
+            rows.append((f"{backend} store load (once)", _measure(_run_load, backend, csv_path, workdir)))
+            rows.append((f"{backend} store query", _measure(_run_store, backend, csv_path, workdir, args.query, args.repeat, False)))
+        rows.append(("sqlite store query+rollup", _measure(_run_store, "sqlite", csv_path, workdir, args.query, args.repeat, True)))
+
+        for name, (timings, rss) in rows:
+            rss = f"{rss:.0f}" if rss is not None else "n/a"
+            print(f"{name:<28}{statistics.median(timings):>10.4f}{min(timings):>10.4f}{rss:>14}")
+
+        parquet_path = os.path.join(workdir, "parquet", "contractual.parquet")
+        print(f"\nparquet size={os.path.getsize(parquet_path) / 1e6:.1f}MB "
+              f"sqlite size={os.path.getsize(os.path.join(workdir, 'store.db')) / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Offline benchmark of the table agent tool path, with no Azure endpoint or network.
+
+For every dataset size it generates synthetic contractual/earned CSVs (benchmarks.synthetic_data),
+then in a fresh process with its own store/catalog/chart directories measures:
+- load: first ingest of each table into the store (rows/sec)
+- direct: execute_sql / get_table_schema / plot_results called directly (p50/p95, rows/sec)
+- fan-out: the QUERIES run one after another, concurrently through the async tools and as one
+  execute_sql_batch call, against the slowest of them alone
+- sequential / magentic: scripted agent turns replayed through benchmarks.fake_runtime
+and the peak RSS of that process. The result cache is off unless --cache is given.
+
+    python -m benchmarks.bench_harness --sizes 10k,1m --backend sqlite
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_runtime import MagenticRuntime, Ref, ScriptedAgent, SequentialRuntime, ToolCall
+from benchmarks.synthetic_data import parse_rows, write_dataset
+
+DATA_DIR = os.path.join("benchmarks", ".data")
+
+# Representative queries: (name, table, sql, scans whole table)
+QUERIES = [
+    ("me_by_channel", "contractual",
+     "SELECT Channel, SUM(ME_Value) FROM contractual GROUP BY Channel", True),
+    ("social_partner_impressions", "earned",
+     "SELECT Partner_Organization, SUM(Total_Impressions) FROM earned WHERE Channel = 'Social' "
+     "GROUP BY Partner_Organization ORDER BY 2 DESC", True),
+    ("me_by_event_both", "contractual,earned",
+     "SELECT c.Seasonal_Event_Name, c.me, e.me FROM "
+     "(SELECT Seasonal_Event_Name, SUM(ME_Value) AS me FROM contractual GROUP BY 1) c JOIN "
+     "(SELECT Seasonal_Event_Name, SUM(ME_Value) AS me FROM earned GROUP BY 1) e "
+     "ON e.Seasonal_Event_Name = c.Seasonal_Event_Name", True),
+    ("raw_rows", "earned", "SELECT * FROM earned", False),
+]
+
+
+def turn_script():
+    """
+    One chat turn as the model would play it: schema lookups, a query, then a chart of its result by handle.
+    """
+    return [
+        [ToolCall("get_table_schema", {"table": "contractual"}),
+         ToolCall("get_table_schema", {"table": "earned"})],
+        [ToolCall("execute_sql", {"query": QUERIES[0][2], "table": "contractual"}, id="by_channel"),
+         ToolCall("execute_sql", {"query": QUERIES[2][2], "table": "contractual,earned"})],
+        [ToolCall("plot_results", {"data": Ref("by_channel", "result_id"), "columns": "Channel, ME_Value",
+                                   "chart_type": "bar"})],
+    ]
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return statistics.median(ordered), p95
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(rows, repeat, llm_latency):
+    """
+    Runs every measurement in this process (configured through the environment) and returns a report.
+    """
+    from agents.agents_functions import table_agent_functions as tools
+    from agents.agents_functions import async_table_agent_functions as async_tools
+    from agents.agents_functions.async_table_agent_functions import async_table_agent_functions
+    from agents.agents_functions.schema_catalog import get_catalog
+    from agents.agents_functions.table_store import get_store
+
+    report = {"rows": rows, "metrics": []}
+
+    def add(name, samples, rows_scanned=None):
+        p50, p95 = _percentiles(samples)
+        metric = {"name": name, "n": len(samples), "p50_ms": p50 * 1000, "p95_ms": p95 * 1000}
+        if rows_scanned:
+            metric["rows_per_s"] = rows_scanned / p50 if p50 else None
+        report["metrics"].append(metric)
+
+    store, catalog = get_store(), get_catalog()
+    for table in store.table_files:
+        start = time.perf_counter()
+        store.ensure_loaded(table)
+        add(f"load {table}", [time.perf_counter() - start], rows_scanned=rows)
+        start = time.perf_counter()
+        catalog.get(table)
+        add(f"catalog build {table}", [time.perf_counter() - start])
+
+    add("get_table_schema", _time(repeat, lambda: tools.get_table_schema("earned")))
+    for name, table, sql, scans in QUERIES:
+        scanned = rows * len(table.split(",")) if scans else None
+        add(f"execute_sql {name}", _time(repeat, lambda: tools.execute_sql(sql, table)), rows_scanned=scanned)
+    data = tools.execute_sql(QUERIES[0][2], "contractual")
+    add("plot_results (first render)", _time(1, lambda: tools.plot_results(data, "Channel, ME_Value", "bar")))
+    add("plot_results (cached)", _time(repeat, lambda: tools.plot_results(data, "Channel, ME_Value", "bar")))
+
+    queries = [{"query": sql, "table": table} for _, table, sql, _ in QUERIES]
+    singles = [min(_time(repeat, lambda q=q: tools.execute_sql(**q))) for q in queries]
+    add("fan-out slowest single query", [max(singles)])
+    add("fan-out sequential", _time(repeat, lambda: [tools.execute_sql(**q) for q in queries]))
+
+    async def concurrent():
+        return await asyncio.gather(*(async_tools.execute_sql(**q) for q in queries))
+
+    add("fan-out concurrent tool calls", _time(repeat, lambda: asyncio.run(concurrent())))
+    add("fan-out execute_sql_batch", _time(repeat, lambda: asyncio.run(async_tools.execute_sql_batch(queries))))
+
+    def agent():
+        return ScriptedAgent("table_agent", async_table_agent_functions, turn_script(), llm_latency=llm_latency)
+
+    sequential = SequentialRuntime([agent()])
+    magentic = MagenticRuntime([agent()], manager_latency=llm_latency, resets=1)
+    for name, runtime in (("sequential turn", sequential), ("magentic run", magentic)):
+        samples, tool_samples = [], {}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            responses = asyncio.run(runtime.run("benchmark"))
+            samples.append(time.perf_counter() - start)
+            for response in responses:
+                for tool, seconds in response.timings:
+                    tool_samples.setdefault(tool, []).append(seconds)
+        add(name, samples)
+        for tool, tool_times in sorted(tool_samples.items()):
+            add(f"  {name}: {tool}", tool_times)
+
+    report["peak_rss_mb"] = _peak_rss_mb()
+    return report
+
+
+def _time(repeat, func):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_report(report):
+    rss = report["peak_rss_mb"]
+    print(f"\n== {report['rows']:,} rows per table, peak RSS {rss:.0f} MB ==" if rss else f"\n== {report['rows']:,} rows ==")
+    print(f"{'metric':<52}{'n':>4}{'p50 ms':>11}{'p95 ms':>11}{'rows/s':>14}")
+    for m in report["metrics"]:
+        rate = f"{m['rows_per_s']:,.0f}" if m.get("rows_per_s") else ""
+        print(f"{m['name']:<52}{m['n']:>4}{m['p50_ms']:>11.2f}{m['p95_ms']:>11.2f}{rate:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10k", help="Comma-separated row counts or presets (10k, 1m, 10m)")
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "parquet"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per model response")
+    parser.add_argument("--cache", action="store_true", help="Keep the query result cache on")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON reports")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.repeat, args.llm_latency)))
+        return
+
+    for size in args.sizes.split(","):
+        rows = parse_rows(size)
+        data_dir = os.path.abspath(os.path.join(DATA_DIR, str(rows)))
+        write_dataset(data_dir, rows)
+        with tempfile.TemporaryDirectory() as workdir:
+            env = dict(
+                os.environ,
+                TABLE_DATA_DIR=data_dir,
+                TABLE_BACKEND=args.backend,
+                TABLE_STORE_PATH=os.path.join(workdir, "store.db"),
+                PARQUET_STORE_DIR=os.path.join(workdir, "parquet"),
+                SCHEMA_CATALOG_PATH=os.path.join(workdir, "schema_catalog.json"),
+                CHART_DIR=os.path.join(workdir, "charts"),
+            )
+            if not args.cache:
+                env["QUERY_CACHE_SIZE"] = "0"
+            cmd = [sys.executable, "-m", "benchmarks.bench_harness", "--worker", str(rows),
+                   "--repeat", str(args.repeat), "--llm-latency", str(args.llm_latency)]
+            out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+        report = json.loads(out.strip().splitlines()[-1])
+        report["backend"] = args.backend
+        print(json.dumps(report) if args.json else "", end="")
+        if not args.json:
+            print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+In-memory size of each table with default pd.read_csv inference ("before") vs the declared
+types of agents_functions.table_schemas ("after"): totals, bytes per row, how many rows fit in
+a worker memory budget, and the columns that changed most.
+
+Uses the configured CSVs by default, or synthetic data with --rows:
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --rows 1m --budget-mb 1024
+"""
+import argparse
+import json
+import os
+
+from benchmarks.bench_harness import DATA_DIR
+from benchmarks.synthetic_data import parse_rows, write_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", help="Synthetic rows per table (row count or 10k/1m/10m) instead of the CSVs")
+    parser.add_argument("--nrows", type=int, help="Only read the first N rows of each CSV")
+    parser.add_argument("--budget-mb", type=float, default=1024, help="Worker memory budget for the rows-per-worker column")
+    parser.add_argument("--top", type=int, default=5, help="Columns listed per table")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON reports")
+    args = parser.parse_args()
+
+    from agents.agents_functions.table_schemas import memory_report
+    from agents.agents_functions.table_store import TABLE_FILES
+
+    files = TABLE_FILES
+    if args.rows:
+        rows = parse_rows(args.rows)
+        files = write_dataset(os.path.abspath(os.path.join(DATA_DIR, str(rows))), rows)
+
+    budget = args.budget_mb * 1024 * 1024
+    for table, path in files.items():
+        report = memory_report(table, path, nrows=args.nrows)
+        if args.json:
+            print(json.dumps(report))
+            continue
+        print(f"\n== {table}: {report['rows']:,} rows ==")
+        print(f"{'':<8}{'MB':>10}{'bytes/row':>12}{'rows per worker':>18}")
+        for label in ("before", "after"):
+            per_row = report[f"{label}_bytes_per_row"]
+            print(f"{label:<8}{report[f'{label}_bytes'] / 1e6:>10.2f}{per_row:>12.1f}{budget / max(per_row, 1):>18,.0f}")
+        print(f"after/before = {report['ratio']:.3f}")
+        print(f"{'column':<40}{'before':>16}{'after':>16}{'bytes before':>14}{'bytes after':>13}")
+        for c in report["columns"][:args.top]:
+            print(f"{c['column']:<40}{c['before_dtype']:>16}{c['after_dtype']:>16}{c['before_bytes']:>14,}{c['after_bytes']:>13,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the size of execute_sql results as the model sees them:
+- "repr": the old format, a Python list of row tuples with no column names
+- "repr+columns": the old format plus the column names, i.e. the same information as compact
+- "compact": the columnar result of agents_functions.result_format (as JSON and as Python repr)
+- "compact+stats": compact with summary statistics
+and the time plot_results spends turning each back into a DataFrame.
+
+Tokens are counted with tiktoken (o200k_base) when it is installed, otherwise estimated as bytes / 4.
+
+    python -m benchmarks.bench_result_format --rows 10k --max-rows 200
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import tempfile
+import time
+
+from benchmarks.bench_harness import DATA_DIR, QUERIES
+from benchmarks.synthetic_data import parse_rows, write_dataset
+
+EXTRA_QUERIES = [
+    ("me_by_partner_channel", "contractual",
+     "SELECT Partner_Organization, Channel, SUM(ME_Value), AVG(Engagements) FROM contractual GROUP BY 1, 2"),
+    ("daily_impressions", "earned",
+     "SELECT Incdence_Date, SUM(Total_Impressions), SUM(ME_Value) FROM earned GROUP BY 1 ORDER BY 1"),
+]
+
+
+def _token_counter():
+    try:
+        import tiktoken
+    except ImportError:
+        return "bytes/4", lambda text: -(-len(text.encode("utf-8")) // 4)
+    encoding = tiktoken.get_encoding("o200k_base")
+    return "tiktoken", lambda text: len(encoding.encode(text))
+
+
+def _best_ms(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10k", help="Synthetic rows per table (row count or 10k/1m/10m)")
+    parser.add_argument("--max-rows", type=int, default=200, help="Result rows kept, like the paging budget")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import pandas as pd
+    from agents.agents_functions.result_format import compact_to_frame, to_compact
+    from agents.agents_functions.table_store import TableStore
+
+    rows = parse_rows(args.rows)
+    files = write_dataset(os.path.abspath(os.path.join(DATA_DIR, str(rows))), rows)
+    counter_name, count_tokens = _token_counter()
+    print(f"rows per table={rows:,} result rows<={args.max_rows} tokens={counter_name}\n")
+    print(f"{'query':<28}{'rows':>5}{'format':>15}{'bytes':>9}{'tokens':>8}{'vs repr':>9}{'parse ms':>10}")
+
+    totals, aggregate_totals = {}, {}
+    with tempfile.TemporaryDirectory() as workdir:
+        store = TableStore(db_path=os.path.join(workdir, "store.db"), table_files=files)
+        for name, table, sql, *_ in QUERIES + EXTRA_QUERIES:
+            tables = table.split(",")
+            for t in tables:
+                store.ensure_loaded(t)
+            with store.connection() as conn:
+                cursor = conn.execute(sql)
+                columns = [d[0] for d in cursor.description]
+                result = cursor.fetchmany(args.max_rows)
+
+            old_text = repr(result)
+            compact = to_compact(columns, result)
+            formats = [
+                ("repr", old_text, lambda: pd.DataFrame(ast.literal_eval(old_text))),
+                ("repr+columns", repr((columns, result)), None),
+                ("compact json", json.dumps(compact, separators=(",", ":")),
+                 lambda: compact_to_frame(json.loads(json.dumps(compact)))),
+                ("compact repr", repr(compact), lambda: compact_to_frame(ast.literal_eval(repr(compact)))),
+                ("compact object", None, lambda: compact_to_frame(compact)),
+                ("compact+stats", json.dumps(to_compact(columns, result, summary=True), separators=(",", ":")), None),
+            ]
+            old_tokens = count_tokens(old_text)
+            for label, text, parse in formats:
+                size = len(text.encode("utf-8")) if text is not None else None
+                tokens = count_tokens(text) if text is not None else None
+                parse_ms = _best_ms(args.repeat, parse) if parse is not None else None
+                ratio = f"{tokens / old_tokens:.2f}x" if tokens is not None else ""
+                print(f"{name:<28}{len(result):>5}{label:>15}"
+                      f"{size if size is not None else '-':>9}{tokens if tokens is not None else '-':>8}{ratio:>9}"
+                      f"{parse_ms if parse_ms is not None else float('nan'):>10.3f}")
+                if tokens is not None:
+                    totals[label] = totals.get(label, 0) + tokens
+                    if re.search(r"\bgroup\s+by\b", sql, re.IGNORECASE):
+                        aggregate_totals[label] = aggregate_totals.get(label, 0) + tokens
+            print()
+
+    print("total tokens: " + ", ".join(f"{label}={tokens}" for label, tokens in totals.items()))
+    print("aggregate queries: " + ", ".join(
+        f"{label}={tokens} ({tokens / aggregate_totals['repr']:.2f}x)" for label, tokens in aggregate_totals.items()))
+
+
+if __name__ == "__main__":
+    main()
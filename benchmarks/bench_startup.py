@@ -0,0 +1,68 @@
+"""
+Startup benchmark for the agent tool modules, based on `python -X importtime`.
+
+Imports each module in a fresh interpreter and reports the cumulative import time and the
+heaviest imports. Exits with status 1 when a module takes longer than --max-ms or pulls in
+one of the stacks that must stay lazy (pandas, matplotlib, seaborn, yaml, duckdb, pyarrow),
+so it can run in CI to catch cold-start regressions.
+
+    python -m benchmarks.bench_startup --max-ms 150
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "agents.agents_functions.table_agent_functions",
+    "agents.agents_functions.async_table_agent_functions",
+    "agents.instructions.loader",
+]
+LAZY_MODULES = ["pandas", "matplotlib", "seaborn", "yaml", "duckdb", "pyarrow"]
+
+
+def import_profile(module):
+    """
+    Returns {module name: cumulative import microseconds} for one fresh import of `module`.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a module's median import exceeds this.")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        median_ms = statistics.median(p[module] for p in profiles) / 1000
+        loaded_lazy = sorted(m for m in LAZY_MODULES if m in profiles[0])
+        print(f"{module}: median {median_ms:.1f} ms over {args.repeat} runs")
+        heaviest = sorted(profiles[-1].items(), key=lambda kv: kv[1], reverse=True)[1:args.top + 1]
+        for name, micros in heaviest:
+            print(f"    {micros / 1000:8.1f} ms  {name}")
+        if loaded_lazy:
+            print(f"    FAIL: imports heavy modules eagerly: {', '.join(loaded_lazy)}")
+            failed = True
+        if args.max_ms is not None and median_ms > args.max_ms:
+            print(f"    FAIL: exceeds --max-ms {args.max_ms}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
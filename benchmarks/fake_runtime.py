@@ -0,0 +1,117 @@
+"""
+Local stand-in for the Azure agent runtime, for benchmarking the tool path offline.
+
+A ScriptedAgent replays the tool calls a model would emit instead of calling an LLM:
+each turn is a list of steps, and each step is the batch of tool calls returned in one
+model response. Calls within a step run concurrently and steps run in order, which is
+how ChatAgent executes function calls. SequentialRuntime and MagenticRuntime drive agents
+the way SequentialBuilder and MagenticBuilder workflows do.
+"""
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Ref:
+    """
+    Placeholder for the result of an earlier call in the same turn, e.g. plot_results(data=Ref("sql")),
+    or for one field of it, e.g. Ref("sql", "result_id").
+    """
+    call_id: str
+    key: str = None
+
+    def resolve(self, results: dict):
+        result = results[self.call_id]
+        return result if self.key is None else result[self.key]
+
+
+@dataclass
+class ToolCall:
+    name: str
+    args: dict
+    id: str = None
+
+
+@dataclass
+class RunResponse:
+    text: str
+    timings: list = field(default_factory=list)  # (tool name, seconds)
+
+
+class ScriptedAgent:
+    """
+    Agent whose "model" replays a fixed script of tool calls.
+    `llm_latency` seconds are awaited before every model response, to simulate model time.
+    """
+
+    def __init__(self, name: str, tools, script, llm_latency: float = 0.0):
+        self.name = name
+        self.tools = {t.__name__: t for t in tools}
+        self.script = script
+        self.llm_latency = llm_latency
+
+    def get_new_thread(self):
+        return []
+
+    async def _call(self, call: ToolCall, results: dict, timings: list):
+        args = {k: v.resolve(results) if isinstance(v, Ref) else v for k, v in call.args.items()}
+        func = self.tools[call.name]
+        start = time.perf_counter()
+        result = func(**args)
+        if inspect.isawaitable(result):
+            result = await result
+        timings.append((call.name, time.perf_counter() - start))
+        if call.id:
+            results[call.id] = result
+        return result
+
+    async def run(self, message: str, thread=None) -> RunResponse:
+        results, timings, outputs = {}, [], []
+        for step in self.script:
+            await asyncio.sleep(self.llm_latency)
+            outputs = await asyncio.gather(*(self._call(c, results, timings) for c in step))
+        await asyncio.sleep(self.llm_latency)  # final answer
+        if thread is not None:
+            thread.append(message)
+        return RunResponse(text=repr(outputs)[:200], timings=timings)
+
+
+class SequentialRuntime:
+    """
+    Runs participants one after another on the same input, like a SequentialBuilder workflow.
+    """
+
+    def __init__(self, participants):
+        self.participants = participants
+
+    async def run(self, message: str) -> list:
+        return [await agent.run(message) for agent in self.participants]
+
+
+class MagenticRuntime:
+    """
+    Round-based orchestration like a MagenticBuilder workflow with the standard manager.
+    Every round the manager (simulated with `manager_latency`) delegates to the next participant;
+    after `resets` full passes the plan is reset and the participants run again, which is the
+    re-run pattern seen when the manager resets after a chart request.
+    """
+
+    def __init__(self, participants, manager_latency: float = 0.0, resets: int = 1, on_event=None):
+        self.participants = participants
+        self.manager_latency = manager_latency
+        self.resets = resets
+        self.on_event = on_event
+
+    async def run(self, message: str) -> list:
+        responses = []
+        round_index = 0
+        for _ in range(self.resets + 1):
+            for agent in self.participants:
+                await asyncio.sleep(self.manager_latency)
+                round_index += 1
+                if self.on_event is not None:
+                    self.on_event({"kind": "round", "round": round_index, "agent": agent.name})
+                responses.append(await agent.run(message))
+        return responses
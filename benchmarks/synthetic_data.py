@@ -0,0 +1,205 @@
+"""
+Synthetic contractual/earned datasets for benchmarks, following tests/dummy_data_creation.ipynb.
+
+Values are drawn the same way as in the notebook (Partner_1..5, Event_1..3, random
+impressions, ...) but generated column-wise with numpy in chunks, so millions of rows
+can be written without holding the whole table in memory.
+
+    python -m benchmarks.synthetic_data --rows 1m --out /tmp/bench_data
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+CHUNK_ROWS = 500_000
+FILE_NAMES = {"contractual": "contractual_dummy_data.csv", "earned": "earned_dummy_data.csv"}
+
+
+def parse_rows(value) -> int:
+    """
+    Accepts a row count or one of the size presets ("10k", "1m", "10m").
+    """
+    return SIZES.get(str(value).lower()) or int(value)
+
+
+def _choice(values):
+    values = np.array(values, dtype=object)
+    return lambda rng, n: values[rng.integers(0, len(values), n)]
+
+
+def _prefixed(prefix, lo, hi):
+    return _choice([f"{prefix}{i}" for i in range(lo, hi + 1)])
+
+
+def _ints(lo, hi):
+    return lambda rng, n: rng.integers(lo, hi + 1, n)
+
+
+def _floats(lo, hi):
+    return lambda rng, n: np.round(rng.uniform(lo, hi, n), 2)
+
+
+def _dates(start="2025-10-22", days=30):
+    base = np.datetime64(start)
+    return lambda rng, n: (base + rng.integers(0, days + 1, n)).astype(str)
+
+
+def _seconds(lo, hi):
+    return lambda rng, n: np.char.add(rng.integers(lo, hi + 1, n).astype(str), "s")
+
+
+_NETWORK = _prefixed("Network_", 1, 5)
+_IMPRESSIONS = _ints(100, 5000)
+
+# (column, generator) in CSV order; earned mirrors tests/dummy_data_creation.ipynb exactly
+EARNED_SPEC = [
+    ("Incdence_Date", _dates()),
+    ("Refresh_Date", _dates()),
+    ("Partner_Organization", _prefixed("Partner_", 1, 5)),
+    ("Channel", _choice(["Online", "TV", "Social"])),
+    ("Asset_Name", _prefixed("Asset_", 1, 10)),
+    ("Seasonal_Event_Name", _prefixed("Event_", 1, 3)),
+    ("Social_Platform", _choice(["Facebook", "Twitter", "Instagram"])),
+    ("Social_Account", _prefixed("Account_", 1, 10)),
+    ("Account_Handle", _prefixed("Handle_", 1, 10)),
+    ("Unique_Social_ID", _prefixed("UID_", 1000, 9999)),
+    ("Digital_Source", _choice(["Source_A", "Source_B"])),
+    ("Unique_Digital_ID", _prefixed("DID_", 1000, 9999)),
+    ("Media_Type", _choice(["Video", "Image"])),
+    ("URL", _prefixed("https://example.com/", 1, 10)),
+    ("Market", _choice(["US", "UK", "SP"])),
+    ("Unique_Broadcast_ID", _prefixed("UBID_", 1000, 9999)),
+    ("Broadcast_Network_(US)", _NETWORK),
+    ("Broadcast_Network_(Local_H)", _NETWORK),
+    ("Broadcast_Network_(Local _A)", _NETWORK),
+    ("Broadcast_Network_(UK)", _NETWORK),
+    ("Broadcast_Network_(SP)", _NETWORK),
+    ("Total_Impressions", _ints(1000, 10000)),
+    ("Social_Impressions", _IMPRESSIONS),
+    ("Digital_Impressions", _IMPRESSIONS),
+    ("Broadcast_Impressions (US|HHLD)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(US National|P2+)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(US Local H|P2+)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(US Local A|P2+)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(UK|P2+)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(SP|P2+)", _IMPRESSIONS),
+    ("Engagements", _ints(10, 1000)),
+    ("Video_Views", _ints(10, 1000)),
+    ("Exposures", _ints(10, 1000)),
+    ("Video_Length", _ints(30, 300)),
+    ("Duration_per_Exposure", _floats(0.1, 5.0)),
+    ("30_Sec_Equivalent", _floats(0, 10)),
+    ("Duration_Factor", _floats(0.5, 2.0)),
+    ("EXT_Factor", _floats(0.5, 2.0)),
+    ("ME_Score", _floats(0, 100)),
+    ("ME_Value", _floats(0, 5000)),
+    ("Home_Team", _prefixed("Team_", 1, 5)),
+    ("Away_Team", _prefixed("Team_", 1, 5)),
+    ("Brand_1", _prefixed("Brand_", 1, 5)),
+    ("Brand_2", _prefixed("Brand_", 1, 5)),
+    ("Content_Message", _prefixed("Message_", 1, 5)),
+    ("Customer_Journey_Stage", _choice(["Awareness", "Consideration", "Decision"])),
+    ("CSA_Targeted", _choice([True, False])),
+    ("Audience_Persona", _prefixed("Persona_", 1, 5)),
+]
+
+# Contractual uses its own export's columns with the same value style
+CONTRACTUAL_SPEC = [
+    ("Incidence_Date", _dates()),
+    ("Refresh_Date", _dates()),
+    ("Incidence_Timezone", _choice(["UTC", "EST", "PST", "GMT"])),
+    ("Partner_Organization", _prefixed("Partner_", 1, 5)),
+    ("Channel", _choice(["Social", "Digital", "Broadcast", "In-Stadium"])),
+    ("Asset_Type", _choice(["Post", "Video", "Banner", "30s Unit"])),
+    ("Seasonal_Event_Name", _prefixed("Event_", 1, 3)),
+    ("Social_Platform", _choice(["Facebook", "Twitter", "Instagram", "TikTok"])),
+    ("Social_Account", _prefixed("Account_", 1, 10)),
+    ("Account_Handle", _prefixed("Handle_", 1, 10)),
+    ("Unique_Social_ID", _prefixed("UID_", 1000, 9999)),
+    ("Digital_Source", _choice(["Source_A", "Source_B"])),
+    ("Unique_Digital_ID", _prefixed("DID_", 1000, 9999)),
+    ("Media_Type", _choice(["Video", "Image"])),
+    ("URL", _prefixed("https://example.com/", 1, 10)),
+    ("Market", _choice(["Regional", "National"])),
+    ("Unique_Broadcast_ID", _prefixed("UBID_", 1000, 9999)),
+    ("Broadcast_Network_(US)", _NETWORK),
+    ("Broadcast_Network_(UK)", _NETWORK),
+    ("Broadcast_Network_(SP)", _NETWORK),
+    ("Total_Impressions", _ints(1000, 10000)),
+    ("Social_Impressions", _IMPRESSIONS),
+    ("Digital_Impressions", _IMPRESSIONS),
+    ("Broadcast_Impressions_(US|HHLD)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(US|P2+)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(UK|P2+)", _IMPRESSIONS),
+    ("Broadcast_Impressions_(SP|P2+)", _IMPRESSIONS),
+    ("Attendance", _ints(0, 80000)),
+    ("Visibility", _choice(["Low", "Medium", "High"])),
+    ("Duration", _seconds(5, 300)),
+    ("Link_Clicks", _ints(0, 5000)),
+    ("Engagements", _ints(10, 1000)),
+    ("Video_Views", _ints(10, 1000)),
+    ("ME_Value", _floats(0, 5000)),
+    ("Organic_or_Paid", _choice(["Organic", "Paid"])),
+    ("Paid_Budget", _floats(0, 25000)),
+    ("Home_Team", _prefixed("Team_", 1, 5)),
+    ("Away_Team", _prefixed("Team_", 1, 5)),
+    ("Brand_1", _prefixed("Brand_", 1, 5)),
+    ("Brand_2", _prefixed("Brand_", 1, 5)),
+    ("Content_Message", _prefixed("Message_", 1, 5)),
+    ("Customer_Journey_Stage", _choice(["Awareness", "Consideration", "Decision"])),
+    ("CSA_Targeted", _choice(["Yes", "No"])),
+    ("Audience_Persona", _prefixed("Persona_", 1, 5)),
+]
+
+SPECS = {"contractual": CONTRACTUAL_SPEC, "earned": EARNED_SPEC}
+
+
+def make_frame(table: str, rows: int, rng) -> pd.DataFrame:
+    return pd.DataFrame({col: gen(rng, rows) for col, gen in SPECS[table]})
+
+
+def write_table(table: str, rows: int, path: str, seed: int = 0):
+    """
+    Writes `rows` synthetic rows of `table` to a CSV, in chunks.
+    """
+    rng = np.random.default_rng(seed)
+    written = 0
+    while written < rows:
+        n = min(CHUNK_ROWS, rows - written)
+        make_frame(table, n, rng).to_csv(path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+        written += n
+
+
+def write_dataset(out_dir: str, rows: int, seed: int = 0) -> dict:
+    """
+    Writes both tables into `out_dir` under their usual file names and returns {table: path}.
+    Existing files with the requested row count are reused.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for i, (table, name) in enumerate(FILE_NAMES.items()):
+        path = os.path.join(out_dir, name)
+        marker = f"{path}.rows"
+        if not (os.path.exists(path) and os.path.exists(marker) and open(marker).read() == str(rows)):
+            write_table(table, rows, path, seed=seed + i)
+            with open(marker, "w") as f:
+                f.write(str(rows))
+        paths[table] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10k", help="Row count or preset: 10k, 1m, 10m")
+    parser.add_argument("--out", default="benchmarks/.data")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for table, path in write_dataset(args.out, parse_rows(args.rows), args.seed).items():
+        print(f"{table}: {path} ({os.path.getsize(path) / 1e6:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
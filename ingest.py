@@ -0,0 +1,28 @@
+import argparse
+import json
+import time
+
+from agents.agents_functions.table_store import get_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the table store from the CSV exports.")
+    parser.add_argument("--table", action="append", help="Table to refresh (repeatable). Defaults to all tables.")
+    parser.add_argument("--full", action="store_true", help="Reload the whole CSV instead of appending new rows.")
+    args = parser.parse_args()
+
+    store = get_store()
+    tables = args.table or list(store.table_files)
+    for table in tables:
+        if not store.has_table(table):
+            parser.error(f"Table '{table}' not found.")
+
+    for table in tables:
+        start = time.perf_counter()
+        summary = store.ingest(table, full=args.full)
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,14 @@ from typing import cast
 from agent_framework import ChatAgent, MagenticBuilder, MagenticCallbackEvent, MagenticCallbackMode, MagenticFinalResultEvent, MagenticOrchestratorMessageEvent, MagenticAgentDeltaEvent
 from agent_framework.azure import AzureAIAgentClient
 from azure.identity import AzureCliCredential
-from agents.agents_functions.table_agent_functions import table_agent_functions
-import yaml
-
-with open("agents/instructions/instructions.yaml", "r", encoding="utf-8") as f:
-    instructions = yaml.safe_load(f)
+from agents.agents_functions.async_table_agent_functions import async_table_agent_functions
+from agents.agents_functions import instrumentation
+from agents.instructions.loader import get_instructions
 
 
 async def main():
+    instructions = get_instructions()
+    instrumentation.configure()
     credential = AzureCliCredential()
 
     # --- Define agents ---
@@ -19,7 +19,7 @@ async def main():
         description="Data assistant for tables 'contractual' and 'earned'",
         instructions=instructions["table_agent_instructions"],
         chat_client=AzureAIAgentClient(async_credential=credential),
-        tools=table_agent_functions
+        tools=async_table_agent_functions
     )
 
     main_agent = ChatAgent(
@@ -32,10 +32,14 @@ async def main():
     # --- Callback for streaming ---
     last_stream_agent_id: str | None = None
     stream_line_open: bool = False
+    orchestrator_round: int = 0
 
     async def on_event(event: MagenticCallbackEvent):
-        nonlocal last_stream_agent_id, stream_line_open
+        nonlocal last_stream_agent_id, stream_line_open, orchestrator_round
         if isinstance(event, MagenticOrchestratorMessageEvent):
+            # Tag the tool calls that follow with this orchestrator round
+            orchestrator_round += 1
+            instrumentation.set_round(orchestrator_round, kind=event.kind)
             print(f"\n[ORCH:{event.kind}]\n{getattr(event.message, 'text', '')}\n{'-'*26}")
         elif isinstance(event, MagenticAgentDeltaEvent):
             if last_stream_agent_id != event.agent_id or not stream_line_open:
@@ -70,8 +74,12 @@ async def main():
         user_input = input("Enter a prompt: ")
         if user_input.lower() == "quit":
             break
-        async for event in workflow.run_stream(user_input):
-            pass  # TODO 
+        orchestrator_round = 0
+        instrumentation.recorder.reset()
+        with instrumentation.run("magentic"):
+            async for event in workflow.run_stream(user_input):
+                pass  # TODO 
+        instrumentation.recorder.print_summary()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -3,13 +3,13 @@ from typing import cast
 from agent_framework import ChatMessage, Role, SequentialBuilder, WorkflowOutputEvent
 from agent_framework.azure import AzureAIAgentClient
 from azure.identity import AzureCliCredential
-from agents.agents_functions.table_agent_functions import table_agent_functions
-import yaml
-
-with open("agents/instructions/instructions.yaml", "r", encoding="utf-8") as f:
-    instructions = yaml.safe_load(f)
+from agents.agents_functions.async_table_agent_functions import async_table_agent_functions
+from agents.agents_functions import instrumentation
+from agents.instructions.loader import get_instructions
 
 async def main():
+    instructions = get_instructions()
+    instrumentation.configure()
     credential = AzureCliCredential()
 
     async with AzureAIAgentClient(async_credential=credential) as chat_client:
@@ -17,7 +17,7 @@ async def main():
         table_agent = chat_client.create_agent(
             name="table_agent",
             instructions=instructions["table_agent_instructions"],
-            tools=table_agent_functions  
+            tools=async_table_agent_functions  
         )
 
         # # --- Main orchestrator agent ---
@@ -37,9 +37,11 @@ async def main():
                 break
 
             outputs: list[list[ChatMessage]] = []
-            async for event in workflow.run_stream(user_input):
-                if isinstance(event, WorkflowOutputEvent):
-                    outputs.append(cast(list[ChatMessage], event.data))
+            instrumentation.recorder.reset()
+            with instrumentation.run("sequential"):
+                async for event in workflow.run_stream(user_input):
+                    if isinstance(event, WorkflowOutputEvent):
+                        outputs.append(cast(list[ChatMessage], event.data))
 
             if outputs:
                 seen_texts = set()
@@ -48,6 +50,7 @@ async def main():
                         seen_texts.add(msg.text)
                         name = msg.author_name or "assistant"
                         print(f"{'-'*60}\n[{name}]\n{msg.text}")
+            instrumentation.recorder.print_summary()
 
 if __name__ == "__main__":
     asyncio.run(main())
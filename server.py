@@ -0,0 +1,136 @@
+import asyncio
+import itertools
+import json
+import os
+import uuid
+from collections import OrderedDict
+from agent_framework.azure import AzureAIAgentClient
+from azure.identity import AzureCliCredential
+from agents.agents_functions.async_table_agent_functions import async_table_agent_functions, run_in_tool_pool
+from agents.agents_functions.schema_catalog import get_catalog
+from agents.agents_functions.table_store import get_store
+from agents.instructions.loader import get_instructions
+
+HOST = os.getenv("AGENT_SERVER_HOST", "127.0.0.1")
+PORT = int(os.getenv("AGENT_SERVER_PORT", "8080"))
+MAX_SESSIONS = int(os.getenv("AGENT_SERVER_MAX_SESSIONS", "1000"))
+MAX_CONCURRENT_RUNS = int(os.getenv("AGENT_SERVER_MAX_CONCURRENT_RUNS", "32"))
+MAX_BODY_BYTES = 1 << 20
+
+
+class ChatServer:
+    """
+    Serves many concurrent conversations with one shared agent.
+    - Each session id gets its own agent thread; messages within a session run in order.
+    - All sessions share the process-wide table store, result cache and chart cache.
+    - Tools run on bounded worker pools, so the event loop only waits on I/O.
+    """
+
+    def __init__(self, agent, max_sessions: int = MAX_SESSIONS, max_concurrent_runs: int = MAX_CONCURRENT_RUNS):
+        self.agent = agent
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session id -> (thread, lock)
+        self._runs = asyncio.Semaphore(max_concurrent_runs)
+
+    def _session(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = (self.agent.get_new_thread(), asyncio.Lock())
+            self._sessions[session_id] = session
+            # Forget the least recently used conversations past the limit, keeping any with a run in flight
+            idle = (sid for sid, (_, lock) in self._sessions.items() if sid != session_id and not lock.locked())
+            for sid in list(itertools.islice(idle, max(len(self._sessions) - self.max_sessions, 0))):
+                del self._sessions[sid]
+        self._sessions.move_to_end(session_id)
+        return session
+
+    async def chat(self, session_id: str, message: str) -> str:
+        thread, lock = self._session(session_id)
+        async with lock, self._runs:
+            response = await self.agent.run(message, thread=thread)
+        return response.text
+
+    async def handle(self, reader, writer):
+        """
+        Minimal HTTP/1.1 handler:
+        - POST /chat with {"session_id": optional, "message": "..."} returns {"session_id", "reply"}.
+        - GET /health returns {"status": "ok", "sessions": n}.
+        """
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            if len(request_line) < 2:
+                status, payload = 400, {"error": "Malformed request."}
+            elif request_line[:2] == ["GET", "/health"]:
+                status, payload = 200, {"status": "ok", "sessions": len(self._sessions)}
+            elif request_line[:2] == ["POST", "/chat"]:
+                length = int(headers.get("content-length", "0"))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "Request body too large."}
+                else:
+                    body = json.loads(await reader.readexactly(length) or b"{}")
+                    message = body.get("message", "") if isinstance(body, dict) else None
+                    if message is None:
+                        status, payload = 400, {"error": "The request body must be a JSON object."}
+                    elif not message:
+                        status, payload = 400, {"error": "Please enter a prompt."}
+                    else:
+                        session_id = body.get("session_id") or uuid.uuid4().hex
+                        reply = await self.chat(session_id, message)
+                        status, payload = 200, {"session_id": session_id, "reply": reply}
+            else:
+                status, payload = 404, {"error": "Not found."}
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {"error": f"Invalid request: {e}"}
+        except Exception as e:
+            status, payload = 500, {"error": f"Run failed: {e}"}
+
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode()
+            + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def warm_up():
+    # Load every table and its schema once before accepting users
+    store, catalog = get_store(), get_catalog()
+    await asyncio.gather(*(
+        run_in_tool_pool(lambda t=t: (store.ensure_loaded(t), catalog.get(t)))
+        for t in store.table_files
+    ))
+
+
+async def main():
+    instructions = get_instructions()
+    credential = AzureCliCredential()
+
+    async with AzureAIAgentClient(async_credential=credential) as chat_client:
+        # One agent definition shared by every session
+        table_agent = chat_client.create_agent(
+            name="table_agent",
+            instructions=instructions["table_agent_instructions"],
+            tools=async_table_agent_functions
+        )
+        await warm_up()
+
+        chat_server = ChatServer(table_agent)
+        server = await asyncio.start_server(chat_server.handle, HOST, PORT)
+        print(f"Serving table_agent on http://{HOST}:{PORT} (POST /chat, GET /health)")
+        async with server:
+            await server.serve_forever()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+import math
+import random
+import sqlite3
+
+import pytest
+
+from agents.agents_functions.rollups import refresh_rollup, rewrite_for_rollup
+
+COLUMNS = ["Channel", "Partner_Organization", "Brand_1", "Social_Platform", "Seasonal_Event_Name",
+           "ME_Value", "Total_Impressions", "Engagements", "URL"]
+
+QUERIES = [
+    "SELECT COUNT(*) FROM contractual",
+    "SELECT COUNT(*) FROM contractual WHERE Channel = 'nope'",
+    "SELECT COUNT(ME_Value) FROM contractual WHERE Channel = 'nope'",
+    "SELECT SUM(ME_Value), AVG(ME_Value), MIN(ME_Value), MAX(ME_Value) FROM contractual WHERE Channel = 'nope'",
+    "SELECT Channel, COUNT(*), COUNT(ME_Value), SUM(ME_Value), AVG(ME_Value), MIN(ME_Value), MAX(ME_Value) "
+    "FROM contractual GROUP BY Channel",
+    "SELECT Channel, Brand_1, SUM(Total_Impressions) AS impressions FROM contractual "
+    "WHERE Social_Platform = 'X' GROUP BY Channel, Brand_1 ORDER BY impressions DESC",
+    "SELECT Partner_Organization, AVG(Engagements) FROM contractual GROUP BY 1 HAVING COUNT(*) > 20",
+    "SELECT Seasonal_Event_Name, SUM(ME_Value) FROM contractual GROUP BY 1 HAVING SUM(ME_Value) > 1e12",
+    "SELECT contractual.Channel, SUM(ME_Value) FROM contractual GROUP BY contractual.Channel",
+    'SELECT "contractual".Channel, SUM(contractual.ME_Value) FROM "contractual" '
+    "WHERE contractual.Channel <> 'contractual.Channel' GROUP BY 1",
+    "SELECT Channel, COUNT(Engagements) FROM contractual WHERE Brand_1 = 'Brand_2' GROUP BY Channel",
+]
+
+NOT_REWRITTEN = [
+    "SELECT URL, SUM(ME_Value) FROM contractual GROUP BY URL",
+    "SELECT SUM(ME_Value) FROM contractual c",
+    "SELECT SUM(other.ME_Value) FROM contractual",
+    "SELECT COUNT(DISTINCT Channel) FROM contractual",
+    "SELECT Channel, SUM(ME_Value) FROM contractual WHERE rowid <= 100 GROUP BY Channel",
+    "SELECT Channel, SUM(ME_Value) FROM contractual WHERE _rowid_ > 5 AND \"oid\" < 50 GROUP BY 1",
+]
+
+
+@pytest.fixture(scope="module")
+def conn():
+    rng = random.Random(7)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE contractual ({', '.join(COLUMNS)})")
+    rows = [
+        (rng.choice(["Social", "Digital", "Broadcast"]), rng.choice(["P1", "P2", "P3", "P4"]),
+         rng.choice(["Brand_1", "Brand_2"]), rng.choice(["X", "Instagram", None]), rng.choice(["Final", "Derby"]),
+         rng.choice([None, rng.uniform(0, 5000)]), rng.randint(0, 10 ** 6), rng.choice([None, rng.randint(0, 500)]),
+         f"https://example.com/{i}")
+        for i in range(500)
+    ]
+    conn.executemany(f"INSERT INTO contractual VALUES ({', '.join('?' for _ in COLUMNS)})", rows)
+    refresh_rollup(conn, "contractual", COLUMNS)
+    yield conn
+    conn.close()
+
+
+def _normalized(cursor):
+    rows = [tuple(round(v, 6) if isinstance(v, float) else v for v in row) for row in cursor.fetchall()]
+    return [d[0] for d in cursor.description], sorted(rows, key=repr)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_rollup_matches_raw_table(conn, query):
+    rewritten = rewrite_for_rollup(query, "contractual", COLUMNS)
+    assert rewritten is not None and "_rollup_contractual" in rewritten
+    raw_columns, raw_rows = _normalized(conn.execute(query))
+    columns, rows = _normalized(conn.execute(rewritten))
+    assert columns == raw_columns
+    assert len(rows) == len(raw_rows)
+    for row, raw_row in zip(rows, raw_rows):
+        for value, raw_value in zip(row, raw_row):
+            if isinstance(raw_value, float):
+                assert math.isclose(value, raw_value, rel_tol=1e-9)
+            else:
+                assert value == raw_value
+
+
+def test_count_of_no_rows_is_zero(conn):
+    rewritten = rewrite_for_rollup("SELECT COUNT(*) FROM contractual WHERE Channel = 'nope'", "contractual", COLUMNS)
+    assert conn.execute(rewritten).fetchall() == [(0,)]
+
+
+@pytest.mark.parametrize("query", NOT_REWRITTEN)
+def test_unsupported_queries_are_not_rewritten(query):
+    assert rewrite_for_rollup(query, "contractual", COLUMNS) is None
@@ -0,0 +1,113 @@
+import sqlite3
+
+import pytest
+
+from agents.agents_functions.sql_guard import _is_alias, describe_error, guard_cost, validate
+
+SCHEMA = {
+    "contractual": ["Channel", "Seasonal_Event_Name", "ME_Value", "Incidence_Date", "Broadcast_Impressions_(US|HHLD)"],
+    "earned": ["Channel", "Seasonal_Event_Name", "ME_Value", "Incdence_Date", "Broadcast_Impressions (US|HHLD)"],
+}
+
+
+@pytest.mark.parametrize("query, code", [
+    ("DELETE FROM contractual", "not_a_query"),
+    ("-- comment\nDROP TABLE earned", "not_a_query"),
+    ("SELECT 1; SELECT 2", "multiple_statements"),
+    ("SELECT Chanel FROM contractual", "unknown_column"),
+    ('SELECT "Chanel" FROM contractual', "unknown_column"),
+    ("SELECT Incidence_Date FROM earned", "unknown_column"),
+    ("SELECT earned.Incidence_Date FROM earned", "unknown_column"),
+    ("SELECT * FROM contractual JOIN nope USING (Channel)", "unknown_table"),
+    ("SELECT nope(1) FROM contractual", "unknown_function"),
+    ("SELECT SUM(Broadcast_Impressions (US|HHLD)) FROM earned", "unquoted_column"),
+    ("SELECT FROM contractual", "syntax_error"),
+    ("SELECT Channel FROM contractual JOIN earned USING (Seasonal_Event_Name)", "ambiguous_column"),
+])
+def test_validate_error_codes(query, code):
+    error = validate(query, SCHEMA)
+    assert error is not None and error["error"] == code, error
+
+
+def test_validate_suggests_close_columns():
+    earned = {"earned": SCHEMA["earned"]}
+    assert validate("SELECT Incidence_Date FROM earned", earned)["suggestions"][0] == "Incdence_Date"
+    assert validate("SELECT SUM(Broadcast_Impressions (US|HHLD)) FROM earned", earned)["suggestions"] == [
+        '"Broadcast_Impressions (US|HHLD)"']
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT Channel, SUM(ME_Value) FROM contractual GROUP BY 1",
+    "WITH c AS (SELECT Channel FROM contractual) SELECT * FROM c",
+    'SELECT e.me FROM (SELECT SUM(ME_Value) AS me FROM earned) "e"',
+    'SELECT SUM(ME_Value) "total", 1 "one", \'a\' "s" FROM contractual "c"',
+    'SELECT "Broadcast_Impressions (US|HHLD)" FROM earned',
+    "SELECT Channel FROM contractual WHERE Channel = 'no \"such\" column'",
+])
+def test_validate_accepts_valid_queries(query):
+    assert validate(query, SCHEMA) is None
+
+
+@pytest.mark.parametrize("query", [
+    "WITH x AS (SELECT 1) INSERT INTO earned (ME_Value) SELECT * FROM x",
+    "WITH x AS (SELECT 1) DELETE FROM contractual",
+    "WITH x AS (SELECT 1) UPDATE earned SET ME_Value = 0",
+])
+def test_writes_are_rejected_by_the_authorizer(query):
+    error = validate(query, SCHEMA)
+    assert error["error"] == "not_a_query" and "read-only" in error["message"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('SELECT x AS "total"', True),
+    ('SELECT SUM(x) "total"', True),
+    ('FROM (SELECT 1) "e"', True),
+    ('FROM contractual "c"', True),
+    ('SELECT 1 "one"', True),
+    ('SELECT "a" "b"', True),
+    ('SELECT "Channel"', False),
+    ('WHERE x = 1 AND "Channel"', False),
+    ('GROUP BY "Channel"', False),
+    ('SELECT a, "Channel"', False),
+    ('SELECT contractual."Channel"', False),
+])
+def test_is_alias(text, expected):
+    assert _is_alias(text, text.rindex('"', 0, text.rindex('"'))) is expected
+
+
+def test_describe_duckdb_errors():
+    error = describe_error('Binder Error: Referenced column "Chanel" not found in FROM clause!', SCHEMA, "")
+    assert error["error"] == "unknown_column" and error["suggestions"] == ["Channel"]
+    assert describe_error("Catalog Error: Table with name nope does not exist!", SCHEMA, "")["error"] == "unknown_table"
+    assert describe_error('Parser Error: syntax error at or near "SELEC"', SCHEMA, "")["error"] == "syntax_error"
+    assert describe_error("Permission Error: Cannot access file", SCHEMA, "")["error"] == "invalid_query"
+
+
+@pytest.fixture(scope="module")
+def conn():
+    conn = sqlite3.connect(":memory:")
+    for table in ("contractual", "earned"):
+        conn.execute(f"CREATE TABLE {table} (Channel, Seasonal_Event_Name, ME_Value)")
+        conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?)",
+                         [(f"C{i % 3}", f"E{i % 2}", float(i)) for i in range(100)])
+    yield conn
+    conn.close()
+
+
+def test_guard_cost_within_budget(conn):
+    query = "SELECT Channel FROM contractual"
+    assert guard_cost(conn, query, ["contractual"], max_cost=10_000) == (query, None)
+
+
+def test_guard_cost_limits_a_streaming_query(conn):
+    query = "SELECT * FROM contractual, earned -- cross product"
+    limited, warning = guard_cost(conn, query, ["contractual", "earned"], max_cost=1000, auto_limit=7)
+    assert limited != query and "limited to 7 rows" in warning
+    assert len(conn.execute(limited).fetchall()) == 7
+
+
+def test_guard_cost_rejects_an_aggregate(conn):
+    query = "SELECT c.Channel, SUM(e.ME_Value) FROM contractual c, earned e GROUP BY 1"
+    limited, error = guard_cost(conn, query, ["contractual", "earned"], max_cost=1000)
+    assert limited is None and error["error"] == "query_too_expensive"
+    assert error["estimated_row_visits"] >= 100 * 100
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from agents.agents_functions.table_store import TableStore
+
+HEADER = "Channel,Partner_Organization,ME_Value,Refresh_Date\n"
+
+
+def _row(i):
+    return f"{['Social', 'Digital'][i % 2]},P{i % 3},{i * 1.5},2025-11-{1 + i % 28:02d}\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "contractual.csv"
+    path.write_text(HEADER + "".join(_row(i) for i in range(10)))
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path, csv_path):
+    store = TableStore(db_path=str(tmp_path / "store.db"), table_files={"contractual": csv_path})
+    yield store
+    store.close()
+
+
+def _touch_later(path):
+    # Make sure the signature changes even when the size does not
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def _table(store):
+    with store.connection() as conn:
+        return conn.execute("SELECT Channel, Partner_Organization, ME_Value FROM contractual ORDER BY rowid").fetchall()
+
+
+def _rollup_rows(store):
+    with store.connection() as conn:
+        return conn.execute('SELECT SUM(row_count) FROM "_rollup_contractual"').fetchone()[0]
+
+
+def test_first_load_and_unchanged(store):
+    summary = store.ingest("contractual")
+    assert summary["mode"] == "full" and summary["rows_added"] == 10 and summary["row_count"] == 10
+    assert store.ingest("contractual")["mode"] == "unchanged"
+
+
+def test_append_ingests_only_new_rows(store, csv_path):
+    version = store.ingest("contractual")["version"]
+    with open(csv_path, "a") as f:
+        f.write(_row(10) + _row(11))
+    summary = store.ingest("contractual")
+    assert summary["mode"] == "append" and summary["rows_added"] == 2 and summary["row_count"] == 12
+    assert summary["version"] != version
+    assert len(_table(store)) == 12 and _rollup_rows(store) == 12
+    assert summary["byte_offset"] == os.path.getsize(csv_path)
+
+
+def test_rewritten_file_is_reloaded_in_full(store, csv_path):
+    store.ingest("contractual")
+    with open(csv_path, "w") as f:
+        f.write(HEADER + "".join(_row(i) for i in range(100, 115)))
+    _touch_later(csv_path)
+    summary = store.ingest("contractual")
+    assert summary["mode"] == "full" and summary["rows_added"] == 15
+    assert _table(store)[0] == ("Social", "P1", 150.0)
+    assert _rollup_rows(store) == 15
+
+
+def test_partial_last_line_waits_for_its_newline(store, csv_path):
+    with open(csv_path, "a") as f:
+        f.write("Digital,P2,")
+    summary = store.ingest("contractual")
+    assert summary["mode"] == "full" and summary["rows_added"] == 10
+    assert summary["byte_offset"] == os.path.getsize(csv_path) - len("Digital,P2,")
+
+    with open(csv_path, "a") as f:
+        f.write("99.5,2025-11-30\n" + "Social,P0,")
+    summary = store.ingest("contractual")
+    assert summary["mode"] == "append" and summary["rows_added"] == 1 and summary["row_count"] == 11
+    assert _table(store)[-1] == ("Digital", "P2", 99.5)
+
+    with open(csv_path, "a") as f:
+        f.write("1.0,2025-11-30\n")
+    summary = store.ingest("contractual")
+    assert summary["rows_added"] == 1 and _table(store)[-1] == ("Social", "P0", 1.0)
+    assert len(_table(store)) == 12 and _rollup_rows(store) == 12